@@ -0,0 +1,27 @@
+import logging
+from typing import Optional
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# One HTTP session shared by the Solana and TON adapters so pooled keep-alive
+# connections (and their TLS handshakes) are reused across lookups.
+# Created lazily so it binds to the running event loop.
+_SESSION: Optional[aiohttp.ClientSession] = None
+
+async def get_session() -> aiohttp.ClientSession:
+    """Return the shared aiohttp session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        _SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, ttl_dns_cache=300, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=5)
+        )
+    return _SESSION
+
+async def close_session() -> None:
+    """Close the shared aiohttp session (called from the bot's post_shutdown hook)."""
+    global _SESSION
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
@@ -1,11 +1,19 @@
 # there are likely to be some API issues due to free tier  limitations such as ratelimits and slow response``
 import logging
+import asyncio
 import aiohttp
+import base58
+import orjson
 from solders.pubkey import Pubkey
+from solders.account_decoder import ParsedAccount
 from solana.rpc.async_api import AsyncClient
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Union
 import os
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+import random
+import time
+import weakref
+from cachetools import TTLCache
+from blockchain.http import get_session
 
 logger = logging.getLogger(__name__)
 
@@ -15,161 +23,527 @@ JUPYTER_TOKEN_API = "https://api.jup.ag/tokens/v1/token"
 JUPITER_SWAP_QUOTE_API = "https://api.jup.ag/swap/v1/quote"
 SOL_MINT = "So11111111111111111111111111111111111111112"
 SOLANA_RPC_URL = os.getenv("SOLANA_RPC_URL", "https://api.mainnet-beta.solana.com")# the more the better birdeye,alchemy etc
-JUPITER_API_KEY = os.getenv("JUPITER_API_KEY", None)
-
-# Retry configuration for RPC calls
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=1, max=10),
-    retry=retry_if_exception_type(Exception),
-    before_sleep=lambda retry_state: logger.debug(f"Retrying RPC call: attempt {retry_state.attempt_number}")
-)
-async def get_sol_price(session: aiohttp.ClientSession) -> float:
-    url = f"{JUPYTER_PRICE_API}?ids={SOL_MINT}&showExtraInfo=true"
-    async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
-        if resp.status == 200:
-            data = await resp.json()
-            if data.get("data") and SOL_MINT in data["data"]:
-                sol_price = float(data["data"][SOL_MINT]["price"])
-                logger.info(f"Fetched SOL price: ${sol_price}")
-                return sol_price
-            logger.warning("No SOL price data from Jupiter")
-        logger.warning(f"Jupiter Price API for SOL returned {resp.status}")
-    return 150.0  # Fallback price alrternatively add additional source for rotation coingecko birdeye 
-
-async def get_solana_token_info(token_address: str) -> Optional[Dict]:
+# Empty string counts as unset so the authenticated path is skipped outright
+JUPITER_API_KEY = os.getenv("JUPITER_API_KEY") or None
+SOL_FALLBACK_PRICE = 150.0
+# Time budget for a whole token lookup, and the cap on any single HTTP attempt within it
+TOKEN_INFO_TIMEOUT = 6.0
+HOP_TIMEOUT = 2.0
+# Reference trade size for price impact estimates, and the liquidity assumed when Jupiter reports none
+IMPACT_TRADE_SOL = 0.01
+ASSUMED_LIQUIDITY_USD = 100.0
+
+# Base58 alphabet (no 0, O, I, l); a 32-byte key encodes to 32-44 characters
+_B58_SET = frozenset(b"123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz")
+
+def estimate_price_impact(liquidity_usd: float, sol_price_usd: float) -> float:
+    """Price impact (%) of an IMPACT_TRADE_SOL buy against a constant-product pool; 100 at zero liquidity."""
+    trade_usd = IMPACT_TRADE_SOL * sol_price_usd
+    return min(100.0 * trade_usd / (liquidity_usd + trade_usd + 1e-9), 100.0)
+
+def is_valid_solana_mint(address: str) -> bool:
+    """Cheap Solana address check: length and alphabet first, then a 32-byte decode."""
+    if not (32 <= len(address) <= 44) or not all(c in _B58_SET for c in address.encode()):
+        return False
+    return len(base58.b58decode(address)) == 32
+
+class CircuitBreaker:
     """
-    Fetch Solana token info with optimized fallbacks and minimal RPC usage.
+    Per-provider circuit breaker so the fallback chain skips providers that are down.
+
+    CLOSED: calls flow normally. OPEN: calls are skipped until recovery_timeout
+    elapses. HALF_OPEN: the next call is a probe; success closes the breaker,
+    failure re-opens it.
     """
-    if not (40 <= len(token_address) <= 44):
-        logger.error(f"Invalid Solana address length: {token_address}")
-        return None
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def is_open(self) -> bool:
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.recovery_timeout:
+            self.state = self.HALF_OPEN
+            logger.info(f"Circuit {self.name} half-open, probing")
+        return self.state == self.OPEN
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit {self.name} closed")
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Circuit {self.name} opened after {self.failures} failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def trip(self) -> None:
+        """Open immediately, e.g. when a rejected API key makes every further call pointless."""
+        if self.state != self.OPEN:
+            logger.warning(f"Circuit {self.name} tripped")
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+
+    def record_status(self, status: int) -> None:
+        """Count 429/5xx as provider failures; any other reply means the provider is up."""
+        if status == 429 or status >= 500:
+            self.record_failure()
+        else:
+            self.record_success()
+
+_BREAKERS = {
+    "dexscreener": CircuitBreaker("dexscreener"),
+    "jup_price": CircuitBreaker("jup_price"),
+    "jup_token": CircuitBreaker("jup_token"),
+    "jup_swap": CircuitBreaker("jup_swap"),
+}
+
+async def _json(resp: aiohttp.ClientResponse):
+    """Decode a response body with orjson (faster than resp.json(), no content-type check)."""
+    return orjson.loads(await resp.read())
+
+# Bulkheads: cap in-flight requests per provider so one slow upstream can't take every connection
+_BULKHEADS = {
+    "dexscreener": asyncio.Semaphore(20),
+    "jup_price": asyncio.Semaphore(20),
+    "jup_token": asyncio.Semaphore(20),
+    "jup_swap": asyncio.Semaphore(10),
+}
+
+def _bulkhead(name: str) -> asyncio.Semaphore:
+    bulkhead = _BULKHEADS[name]
+    if bulkhead.locked():
+        logger.warning(f"{name} bulkhead full, request queued")
+    return bulkhead
+
+# Transient statuses worth retrying; any other 4xx is returned to the caller as-is
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+def _retry_after(resp: aiohttp.ClientResponse) -> Optional[float]:
+    """Parse a Retry-After header given in seconds; None if absent or not numeric."""
     try:
-        Pubkey.from_string(token_address)  # Validate address upfront
-    except ValueError as e:
-        logger.error(f"Invalid Solana address format: {token_address} - Error: {str(e)}")
+        return max(0.0, float(resp.headers["Retry-After"]))
+    except (KeyError, ValueError):
         return None
 
-    async with aiohttp.ClientSession() as session:
-        sol_price_usd = await get_sol_price(session)
+def _hop_timeout(deadline: Optional[float]) -> aiohttp.ClientTimeout:
+    """Per-attempt timeout: the session default without a deadline, else what is left of it."""
+    if deadline is None:
+        return aiohttp.ClientTimeout(total=5)
+    remaining = deadline - asyncio.get_running_loop().time()
+    return aiohttp.ClientTimeout(total=min(HOP_TIMEOUT, max(0.2, remaining)))
 
-        # Try Dexscreener first (fastest)
-        token_info = await fetch_from_dexscreener(session, token_address, sol_price_usd)
-        if token_info:
-            logger.info(f"Fetched Solana token info from Dexscreener for {token_address}")
-            return token_info
+async def _get_with_retry(
+    session: aiohttp.ClientSession,
+    url: str,
+    *,
+    breaker: Optional[CircuitBreaker] = None,
+    deadline: Optional[float] = None,
+    max_attempts: int = 3,
+    base: float = 0.1,
+    cap: float = 1.0,
+    **kwargs
+) -> aiohttp.ClientResponse:
+    """
+    GET with bounded exponential backoff and full jitter on 429/5xx, timeouts and
+    connection errors. Every attempt is recorded on the breaker, and retrying stops
+    as soon as it opens. A Retry-After longer than cap ends the retries early.
+    With a deadline (event-loop time), each attempt is bounded by the remaining
+    budget and no retry is scheduled past it.
 
-        # Fallback to Jupiter free tier (no auth needed)
-        token_info = await fetch_from_jupiter_free(session, token_address, sol_price_usd)
-        if token_info:
-            logger.info(f"Fetched Solana token info from Jupiter (free tier) for {token_address}")
-            return token_info
+    The caller owns the returned response and must release it (use `async with`).
+    """
+    loop = asyncio.get_running_loop()
+    for attempt in range(max_attempts):
+        last_attempt = attempt == max_attempts - 1
+        try:
+            resp = await session.get(url, timeout=_hop_timeout(deadline), **kwargs)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if breaker:
+                breaker.record_failure()
+            delay = random.uniform(0, min(cap, base * 2 ** attempt))
+            if last_attempt or (breaker and breaker.is_open()) or (deadline is not None and loop.time() + delay >= deadline):
+                raise
+            logger.debug(f"GET {url} failed ({str(e)}), retrying in {delay:.2f}s")
+        else:
+            if breaker:
+                breaker.record_status(resp.status)
+            if resp.status not in RETRYABLE_STATUSES or last_attempt or (breaker and breaker.is_open()):
+                return resp
+            retry_after = _retry_after(resp)
+            if retry_after is not None and retry_after > cap:
+                return resp
+            delay = retry_after if retry_after is not None else random.uniform(0, min(cap, base * 2 ** attempt))
+            if deadline is not None and loop.time() + delay >= deadline:
+                return resp
+            resp.release()
+            logger.debug(f"GET {url} returned {resp.status}, retrying in {delay:.2f}s")
+        await asyncio.sleep(delay)
+    # The last attempt always returns or raises, so only an empty range gets here
+    raise ValueError(f"max_attempts must be at least 1, got {max_attempts}")
 
-        # Authenticated Jupiter only if API key exists and free tier fails
-        if JUPITER_API_KEY:
-            token_info = await fetch_from_jupiter_authenticated(session, token_address, sol_price_usd)
+# Per-token results are cached once, in services.token_info; only the SOL price,
+# shared by every lookup, is cached here, no longer than a token quote lives there
+_SOL_PRICE_CACHE: TTLCache = TTLCache(maxsize=1, ttl=15)
+# One lock per cache key so concurrent SOL price misses share a single upstream fetch
+_LOCKS: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+def _get_lock(key: str) -> asyncio.Lock:
+    lock = _LOCKS.get(key)
+    if lock is None:
+        lock = _LOCKS[key] = asyncio.Lock()
+    return lock
+
+async def get_sol_price(session: aiohttp.ClientSession, deadline: Optional[float] = None) -> float:
+    """Return the SOL/USD price, served from a 15 s cache when possible."""
+    if SOL_MINT in _SOL_PRICE_CACHE:
+        return _SOL_PRICE_CACHE[SOL_MINT]
+    async with _get_lock(SOL_MINT):
+        if SOL_MINT in _SOL_PRICE_CACHE:
+            return _SOL_PRICE_CACHE[SOL_MINT]
+        sol_price = await fetch_sol_price(session, deadline)
+        if sol_price is None:
+            return SOL_FALLBACK_PRICE  # Fallback price alrternatively add additional source for rotation coingecko birdeye
+        _SOL_PRICE_CACHE[SOL_MINT] = sol_price
+        return sol_price
+
+async def fetch_sol_price(session: aiohttp.ClientSession, deadline: Optional[float] = None) -> Optional[float]:
+    prices = await fetch_jupiter_prices(session, [SOL_MINT], deadline)
+    if SOL_MINT not in prices:
+        logger.warning("No SOL price data from Jupiter")
+        return None
+    sol_price = float(prices[SOL_MINT]["price"])
+    logger.info(f"Fetched SOL price: ${sol_price}")
+    return sol_price
+
+async def get_solana_token_info(token_address: str, with_metadata: bool = True) -> Optional[Dict]:
+    """
+    Fetch Solana token info with optimized fallbacks and minimal RPC usage.
+    Caching and coalescing concurrent lookups are left to services.token_info.
+
+    Callers that already know the name/symbol pass with_metadata=False to fetch the
+    quote only: the Jupiter fallbacks then skip the Token API, and name/symbol come
+    back as placeholders. Dexscreener returns both in one call either way.
+    """
+    if not is_valid_solana_mint(token_address):  # Validate address upfront
+        logger.error(f"Invalid Solana address format: {token_address}")
+        return None
+
+    session = await get_session()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + TOKEN_INFO_TIMEOUT
+
+    try:
+        async with asyncio.timeout_at(deadline):
+            # On a SOL price cache miss, one Price API call returns both SOL and the token,
+            # and the Jupiter fallback reuses it. It runs concurrently with Dexscreener
+            prices = None
+            sol_price_usd = _SOL_PRICE_CACHE.get(SOL_MINT)
+            if sol_price_usd is None:
+                prices, token_info = await asyncio.gather(
+                    fetch_jupiter_prices(session, [SOL_MINT, token_address], deadline),
+                    fetch_from_dexscreener(session, token_address, deadline),
+                    return_exceptions=True
+                )
+                if isinstance(prices, BaseException):
+                    logger.warning(f"Jupiter price fetch failed: {str(prices)}")
+                    prices = None
+                if isinstance(token_info, BaseException):
+                    logger.error(f"Dexscreener failed for {token_address}: {str(token_info)}")
+                    token_info = None
+                if prices and SOL_MINT in prices:
+                    sol_price_usd = _SOL_PRICE_CACHE[SOL_MINT] = float(prices[SOL_MINT]["price"])
+                else:
+                    logger.warning("No SOL price data from Jupiter, using fallback")
+                    sol_price_usd = SOL_FALLBACK_PRICE
+            else:
+                token_info = await fetch_from_dexscreener(session, token_address, deadline)
+
+            # Dexscreener is the primary (fastest) source
+            if token_info:
+                token_info["price_impact"] = estimate_price_impact(token_info["liquidity"], sol_price_usd)
+                logger.info(f"Fetched Solana token info from Dexscreener for {token_address}")
+                return token_info
+
+            # Fallback to Jupiter free tier (no auth needed)
+            token_info = await fetch_from_jupiter_free(session, token_address, sol_price_usd, deadline, prices, with_metadata)
             if token_info:
-                logger.info(f"Fetched detailed Solana token info from Jupiter (authenticated) for {token_address}")
+                logger.info(f"Fetched Solana token info from Jupiter (free tier) for {token_address}")
                 return token_info
 
-        logger.error(f"No token info found for {token_address}")
+            # Authenticated Jupiter only if API key exists and free tier fails
+            if JUPITER_API_KEY:
+                token_info = await fetch_from_jupiter_authenticated(session, token_address, sol_price_usd, deadline, with_metadata)
+                if token_info:
+                    logger.info(f"Fetched detailed Solana token info from Jupiter (authenticated) for {token_address}")
+                    return token_info
+
+            logger.error(f"No token info found for {token_address}")
+            return None
+    except asyncio.TimeoutError:
+        logger.error(f"Token info lookup for {token_address} exceeded {TOKEN_INFO_TIMEOUT}s budget")
+        return None
+
+# Dexscreener accepts up to 30 comma-separated addresses per call; lookups arriving
+# within DEXSCREENER_BATCH_WINDOW of each other share one request
+DEXSCREENER_BATCH_WINDOW = 0.01
+DEXSCREENER_BATCH_SIZE = 30
+_DEX_PENDING: "Dict[str, asyncio.Future[Optional[Dict]]]" = {}
+# Latest deadline among the pending lookups; None once any of them has no deadline
+_dex_batch_deadline: Optional[float] = None
+_DEX_FLUSHES: "set[asyncio.Task]" = set()  # Strong refs so pending flushes aren't garbage collected
+
+async def fetch_from_dexscreener(session: aiohttp.ClientSession, token_address: str, deadline: Optional[float] = None) -> Optional[Dict]:
+    """
+    Fetch token info from Dexscreener. price_impact depends on the SOL price and
+    is filled in by the caller, so this call can run alongside the SOL price fetch.
+    Concurrent lookups are micro-batched into multi-address requests. A batch runs
+    until the latest deadline among its callers; each caller's own timeout bounds
+    how long it waits.
+    """
+    global _dex_batch_deadline
+    breaker = _BREAKERS["dexscreener"]
+    if breaker.is_open():
+        logger.warning(f"Dexscreener circuit open, skipping {token_address}")
         return None
+    loop = asyncio.get_running_loop()
+    if not _DEX_PENDING:
+        # First lookup of a new batch schedules the flush
+        _dex_batch_deadline = deadline
+        flush = loop.create_task(_flush_dexscreener_batch(session))
+        _DEX_FLUSHES.add(flush)
+        flush.add_done_callback(_DEX_FLUSHES.discard)
+    elif _dex_batch_deadline is not None:
+        _dex_batch_deadline = None if deadline is None else max(_dex_batch_deadline, deadline)
+    fut = _DEX_PENDING.get(token_address)
+    if fut is None:
+        fut = _DEX_PENDING[token_address] = loop.create_future()
+    # Shield so a caller hitting its deadline doesn't cancel the result for the others
+    token_info = await asyncio.shield(fut)
+    return dict(token_info) if token_info else None
 
-async def fetch_from_dexscreener(session: aiohttp.ClientSession, token_address: str, sol_price_usd: float) -> Optional[Dict]:
-    url = f"{DEXSCREENER_API}/{token_address}"
+async def _flush_dexscreener_batch(session: aiohttp.ClientSession) -> None:
+    await asyncio.sleep(DEXSCREENER_BATCH_WINDOW)
+    pending = dict(_DEX_PENDING)
+    _DEX_PENDING.clear()
+    deadline = _dex_batch_deadline
+    addresses = list(pending)
+    chunks = [addresses[i:i + DEXSCREENER_BATCH_SIZE] for i in range(0, len(addresses), DEXSCREENER_BATCH_SIZE)]
     try:
-        async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
-            if resp.status != 200 or not (data := await resp.json()).get("pairs"):
-                logger.warning(f"Dexscreener returned {resp.status} or no pairs for {token_address}")
-                return None
-            pair = next((p for p in data["pairs"] if p.get("chainId") == "solana"), None)
-            if not pair:
-                logger.warning(f"No Solana pair found on Dexscreener for {token_address}")
-                return None
-            liquidity = pair.get("liquidity", {}).get("usd", 0.0)
-            price_usd = float(pair["priceUsd"])
-            trade_amount_usd = 0.01 * sol_price_usd
-            price_impact = min((trade_amount_usd / (liquidity + trade_amount_usd)) * 100 if liquidity > 0 else 100.0, 100.0)
-            return {
-                "name": pair["baseToken"]["name"],
-                "symbol": pair["baseToken"]["symbol"],
+        results = await asyncio.gather(*(_fetch_dexscreener_chunk(session, chunk, deadline) for chunk in chunks))
+        for found in results:
+            for address, token_info in found.items():
+                pending[address].set_result(token_info)
+    finally:
+        # Anything without a result (no pair, failed request) resolves to None
+        for fut in pending.values():
+            if not fut.done():
+                fut.set_result(None)
+
+async def _fetch_dexscreener_chunk(session: aiohttp.ClientSession, addresses: List[str], deadline: Optional[float]) -> Dict[str, Dict]:
+    """Fetch up to DEXSCREENER_BATCH_SIZE tokens in one call; returns {address: token info} for the ones found."""
+    url = f"{DEXSCREENER_API}/{','.join(addresses)}"
+    try:
+        async with _bulkhead("dexscreener"):
+            async with await _get_with_retry(session, url, breaker=_BREAKERS["dexscreener"], deadline=deadline) as resp:
+                if resp.status != 200 or not (data := await _json(resp)).get("pairs"):
+                    logger.warning(f"Dexscreener returned {resp.status} or no pairs for {addresses}")
+                    return {}
+                pairs = data["pairs"]
+    except Exception as e:
+        logger.error(f"Dexscreener failed for {addresses}: {str(e)}")
+        return {}
+
+    found = {}
+    solana_pairs = [p for p in pairs if p.get("chainId") == "solana"]
+    for token_address in addresses:
+        side = "baseToken"
+        pair = next((p for p in solana_pairs if p.get("baseToken", {}).get("address") == token_address), None)
+        if not pair:
+            # Some tokens (stables, wrapped assets) only appear as the quote side
+            side = "quoteToken"
+            pair = next((p for p in solana_pairs if p.get("quoteToken", {}).get("address") == token_address), None)
+        if not pair:
+            logger.warning(f"No Solana pair found on Dexscreener for {token_address}")
+            continue
+        try:
+            is_base = side == "baseToken"
+            # priceUsd, marketCap and info describe the base token; priceNative is base
+            # in quote units, so the quote token's USD price is priceUsd / priceNative
+            info = pair.get("info", {}) if is_base else {}
+            found[token_address] = {
+                "name": pair[side]["name"],
+                "symbol": pair[side]["symbol"],
                 "address": token_address,
-                "price_usd": price_usd,
-                "liquidity": liquidity,
-                "market_cap": float(pair.get("marketCap", pair.get("fdv", 0))),
-                "price_impact": price_impact,
-                "image": pair.get("info", {}).get("imageUrl", ""),
+                "price_usd": float(pair["priceUsd"]) if is_base else float(pair["priceUsd"]) / float(pair["priceNative"]),
+                "liquidity": pair.get("liquidity", {}).get("usd", 0.0),
+                "market_cap": float(pair.get("marketCap", pair.get("fdv", 0))) if is_base else 0.0,
+                "price_impact": 0.0,  # Set by get_solana_token_info
+                "image": info.get("imageUrl", ""),
                 "holders_count": 0,  # Not available
                 "mintable": False,  # Not available
                 "renounced": False,  # Not available
-                "social": [item["url"] for item in pair.get("info", {}).get("socials", [])],
-                "websites": [site["url"] for site in pair.get("info", {}).get("websites", [])]
+                "social": [item["url"] for item in info.get("socials", [])],
+                "websites": [site["url"] for site in info.get("websites", [])]
             }
-    except Exception as e:
-        logger.error(f"Dexscreener failed for {token_address}: {str(e)}")
-        return None
+        except (KeyError, TypeError, ValueError, ZeroDivisionError) as e:
+            logger.error(f"Malformed Dexscreener pair for {token_address}: {str(e)}")
+    return found
+
+async def fetch_jupiter_token_metadata(session: aiohttp.ClientSession, token_address: str, headers: Optional[Dict] = None, deadline: Optional[float] = None) -> Dict:
+    """Fetch name/symbol for a mint from the Jupiter token API; returns {} on a non-200 reply."""
+    breaker = _BREAKERS["jup_token"]
+    if breaker.is_open():
+        logger.warning(f"Jupiter Token API circuit open, skipping {token_address}")
+        return {}
+    token_url = f"{JUPYTER_TOKEN_API}/{token_address}"
+    async with _bulkhead("jup_token"):
+        async with await _get_with_retry(session, token_url, breaker=breaker, headers=headers, deadline=deadline) as resp:
+            if resp.status == 200:
+                return await _json(resp)
+            logger.warning(f"Jupiter Token API returned {resp.status} for {token_address}")
+            return {}
 
-async def fetch_from_jupiter_authenticated(session: aiohttp.ClientSession, token_address: str, sol_price_usd: float) -> Optional[Dict]:
+async def fetch_jupiter_quote(session: aiohttp.ClientSession, token_address: str, headers: Dict, deadline: Optional[float] = None) -> Optional[Dict]:
+    """Fetch a 0.001 SOL -> token swap quote from the authenticated Jupiter API."""
+    breaker = _BREAKERS["jup_swap"]
+    if breaker.is_open():
+        logger.warning(f"Jupiter Swap API circuit open, skipping {token_address}")
+        return None
     url = f"{JUPITER_SWAP_QUOTE_API}?inputMint={SOL_MINT}&outputMint={token_address}&amount=1000000&slippageBps=50"
-    headers = {"Authorization": f"Bearer {JUPITER_API_KEY}"}
-    try:
-        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=5)) as resp:
+    async with _bulkhead("jup_swap"):
+        async with await _get_with_retry(session, url, breaker=breaker, headers=headers, deadline=deadline) as resp:
+            if resp.status in (401, 403):
+                logger.error(f"Jupiter Swap API rejected JUPITER_API_KEY ({resp.status})")
+                breaker.trip()
+                return None
             if resp.status != 200:
                 logger.error(f"Jupiter Swap API returned {resp.status}")
                 return None
-            data = await resp.json()
-            price_usd = float(data["outAmount"]) / 1_000_000 * sol_price_usd
-            price_impact = float(data.get("priceImpactPct", 0.0)) * 100
-
-            token_url = f"{JUPYTER_TOKEN_API}/{token_address}"
-            async with session.get(token_url, headers=headers, timeout=aiohttp.ClientTimeout(total=5)) as token_resp:
-                token_data = await token_resp.json() if token_resp.status == 200 else {}
-                name = token_data.get("name", "Unknown")
-                symbol = token_data.get("symbol", "UNK")
-            return {
-                "name": name,
-                "symbol": symbol,
-                "address": token_address,
-                "price_usd": price_usd,
-                "liquidity": 0.0,
-                "market_cap": 0.0,
-                "price_impact": price_impact,
-                "image": "",
-                "holders_count": 0,
-                "mintable": False,
-                "renounced": False,
-                "social": [],
-                "websites": []
-            }
+            return await _json(resp)
+
+async def fetch_jupiter_prices(session: aiohttp.ClientSession, mints: List[str], deadline: Optional[float] = None) -> Dict[str, Dict]:
+    """
+    Fetch price and extra market info for several mints in one Jupiter Price API call.
+    Returns {mint: price entry} for the mints Jupiter knows; {} on failure.
+    """
+    breaker = _BREAKERS["jup_price"]
+    if breaker.is_open():
+        logger.warning(f"Jupiter Price API circuit open, skipping {mints}")
+        return {}
+    price_url = f"{JUPYTER_PRICE_API}?ids={','.join(mints)}&showExtraInfo=true"
+    async with _bulkhead("jup_price"):
+        async with await _get_with_retry(session, price_url, breaker=breaker, deadline=deadline) as resp:
+            if resp.status == 200:
+                data = await _json(resp)
+                return {mint: entry for mint, entry in (data.get("data") or {}).items() if entry}
+            logger.warning(f"Jupiter Price API returned {resp.status} for {mints}")
+            return {}
+
+async def fetch_from_jupiter_authenticated(session: aiohttp.ClientSession, token_address: str, sol_price_usd: float, deadline: Optional[float] = None, with_metadata: bool = True) -> Optional[Dict]:
+    headers = {"Authorization": f"Bearer {JUPITER_API_KEY}"}
+    try:
+        token_data: Union[Dict, BaseException] = {}
+        if with_metadata:
+            # Quote and metadata are independent; a metadata failure must not cancel the quote
+            data, token_data = await asyncio.gather(
+                fetch_jupiter_quote(session, token_address, headers, deadline),
+                fetch_jupiter_token_metadata(session, token_address, headers, deadline),
+                return_exceptions=True
+            )
+        else:
+            data = await fetch_jupiter_quote(session, token_address, headers, deadline)
+        if isinstance(data, BaseException):
+            raise data
+        if not data:
+            return None
+        if isinstance(token_data, BaseException):
+            logger.warning(f"Jupiter token metadata fetch failed for {token_address}: {str(token_data)}")
+            token_data = {}
+        price_usd = float(data["outAmount"]) / 1_000_000 * sol_price_usd
+        price_impact = float(data.get("priceImpactPct", 0.0)) * 100
+        name = token_data.get("name", "Unknown")
+        symbol = token_data.get("symbol", "UNK")
+        return {
+            "name": name,
+            "symbol": symbol,
+            "address": token_address,
+            "price_usd": price_usd,
+            "liquidity": 0.0,
+            "market_cap": 0.0,
+            "price_impact": price_impact,
+            "image": "",
+            "holders_count": 0,
+            "mintable": False,
+            "renounced": False,
+            "social": [],
+            "websites": []
+        }
     except Exception as e:
         logger.error(f"Jupiter authenticated fetch failed: {str(e)}")
         return None
 
-async def fetch_from_jupiter_free(session: aiohttp.ClientSession, token_address: str, sol_price_usd: float) -> Optional[Dict]:
-    price_url = f"{JUPYTER_PRICE_API}?ids={token_address}&showExtraInfo=true"
-    token_url = f"{JUPYTER_TOKEN_API}/{token_address}"
-    
+async def fetch_from_jupiter_free(
+    session: aiohttp.ClientSession,
+    token_address: str,
+    sol_price_usd: float,
+    deadline: Optional[float] = None,
+    prices: Optional[Dict[str, Dict]] = None,
+    with_metadata: bool = True
+) -> Optional[Dict]:
+    """
+    Build token info from the free Jupiter APIs. `prices` is a result of
+    fetch_jupiter_prices that already covered token_address, if the caller has one.
+    With with_metadata=False the Token API is skipped and name/symbol stay placeholders.
+    """
     price_usd, liquidity_usd, market_cap, price_impact = 0.0, 0.0, 0.0, 0.0
     name, symbol = "Unknown", "UNK"
-    
-    # Fetch price and market data
-    async with session.get(price_url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
-        if resp.status == 200 and (data := await resp.json()).get("data", {}).get(token_address):
-            token_data = data["data"][token_address]
-            price_usd = float(token_data["price"])
-            market_cap = float(token_data.get("extraInfo", {}).get("marketCap", 0.0)) or 0.0
-            liquidity_usd = float(token_data.get("extraInfo", {}).get("liquidity", 0.0)) or 0.0
-            price_impact = float(token_data.get("extraInfo", {}).get("depth", {}).get("buyPriceImpactRatio", {}).get("depth", {}).get("10", 0.0))
-        else:
-            logger.warning(f"Jupiter Price API returned {resp.status} or no data for {token_address}")
+    metadata: Union[Dict, BaseException] = {}
+    token_data: Union[Dict, None, BaseException]
 
-    # Fetch token metadata only if price data exists
+    if prices is not None:
+        token_data = prices.get(token_address)
+        if with_metadata:
+            try:
+                metadata = await fetch_jupiter_token_metadata(session, token_address, deadline=deadline)
+            except Exception as e:
+                metadata = e
+    elif not with_metadata:
+        try:
+            token_data = (await fetch_jupiter_prices(session, [token_address], deadline)).get(token_address)
+        except Exception as e:
+            token_data = e
+    else:
+        # Fetch price/market data and token metadata concurrently
+        prices, metadata = await asyncio.gather(
+            fetch_jupiter_prices(session, [token_address], deadline),
+            fetch_jupiter_token_metadata(session, token_address, deadline=deadline),
+            return_exceptions=True
+        )
+        token_data = prices if isinstance(prices, BaseException) else prices.get(token_address)
+    if isinstance(token_data, BaseException):
+        logger.warning(f"Jupiter Price API failed for {token_address}: {str(token_data)}")
+    elif token_data:
+        price_usd = float(token_data["price"])
+        market_cap = float(token_data.get("extraInfo", {}).get("marketCap", 0.0)) or 0.0
+        liquidity_usd = float(token_data.get("extraInfo", {}).get("liquidity", 0.0)) or 0.0
+        price_impact = float(token_data.get("extraInfo", {}).get("depth", {}).get("buyPriceImpactRatio", {}).get("depth", {}).get("10", 0.0))
+
+    # Token metadata is only trusted when price data exists
     if price_usd > 0:
-        async with session.get(token_url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
-            if resp.status == 200:
-                data = await resp.json()
-                name = data.get("name", "Unknown")
-                symbol = data.get("symbol", "UNK")
+        if isinstance(metadata, BaseException):
+            logger.warning(f"Jupiter Token API failed for {token_address}: {str(metadata)}")
+        else:
+            name = metadata.get("name", "Unknown")
+            symbol = metadata.get("symbol", "UNK")
 
     # RPC for mintable/renounced only (skip holders_count to avoid rate limits)
     holders_count, mintable, renounced = 0, False, False
@@ -177,17 +551,18 @@ async def fetch_from_jupiter_free(session: aiohttp.ClientSession, token_address:
         async with AsyncClient(SOLANA_RPC_URL) as rpc:
             try:
                 pubkey = Pubkey.from_string(token_address)
-                mint_data = await rpc.get_account_info(pubkey)
-                if mint_data.value:
-                    mintable = mint_data.value.data.parsed["info"]["mintAuthority"] is not None
-                    renounced = mint_data.value.data.parsed["info"]["mintAuthority"] is None
+                mint_data = await rpc.get_account_info_json_parsed(pubkey)
+                if mint_data.value and isinstance(mint_data.value.data, ParsedAccount):
+                    parsed = mint_data.value.data.parsed
+                    info = parsed.get("info") if isinstance(parsed, dict) else None
+                    if isinstance(info, dict):
+                        mintable = info.get("mintAuthority") is not None
+                        renounced = not mintable
             except Exception as e:
                 logger.warning(f"RPC fetch skipped for {token_address} due to: {str(e)}")
 
         if price_impact == 0.0:
-            trade_amount_usd = 0.01 * sol_price_usd
-            assumed_liquidity = liquidity_usd if liquidity_usd > 0 else 100.0
-            price_impact = min((trade_amount_usd / (assumed_liquidity + trade_amount_usd)) * 100, 100.0)
+            price_impact = estimate_price_impact(liquidity_usd or ASSUMED_LIQUIDITY_USD, sol_price_usd)
 
         return {
             "name": name,
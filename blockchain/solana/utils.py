@@ -1,5 +1,6 @@
 import logging
 import aiohttp
+from blockchain.http import get_session
 from solders.pubkey import Pubkey
 from solana.rpc.async_api import AsyncClient
 
@@ -52,17 +53,17 @@ async def get_sol_price() -> float:
         Exception: If the network request fails or the API response is malformed.
     """
     try:
-        async with aiohttp.ClientSession() as session:
-            url = f"{COINGECKO_API_URL}/simple/price?ids=solana&vs_currencies=usd"
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    price = data.get("solana", {}).get("usd", 0.0)
-                    logger.info(f"Fetched SOL price: ${price}")
-                    return price
-                else:
-                    logger.error(f"Failed to fetch SOL price: {response.status}")
-                    return 0.0
+        session = await get_session()
+        url = f"{COINGECKO_API_URL}/simple/price?ids=solana&vs_currencies=usd"
+        async with session.get(url) as response:
+            if response.status == 200:
+                data = await response.json()
+                price = data.get("solana", {}).get("usd", 0.0)
+                logger.info(f"Fetched SOL price: ${price}")
+                return price
+            else:
+                logger.error(f"Failed to fetch SOL price: {response.status}")
+                return 0.0
     except Exception as e:
         logger.error(f"Error fetching SOL price: {str(e)}")
         return 0.0
\ No newline at end of file
@@ -13,7 +13,7 @@ import os
 logger = logging.getLogger(__name__)
 
 # Configs
-API_KEY = os.getenv("TON_API_KEY", "AGVENPU5U7V6FDQAAAAEOR3JTJPI7Q7EFPHIOEUOEVVEHZ452BPDMPC2JCBNKBBWTJMHCBI")
+API_KEY = os.getenv("TON_API_KEY")
 IS_TESTNET = os.getenv("IS_TESTNET", "False") == "True"
 JETTON_DECIMALS = 9  # Assuming 9 decimals for the jetton (e.g., USD₮), adjust if needed
 DEFAULT_SLIPPAGE_BPS = 50  # Default 0.5% slippage
@@ -13,7 +13,7 @@ from typing import Dict
 logger = logging.getLogger(__name__)
 
 # Configs
-API_KEY = os.getenv("TON_API_KEY", "AGVENPU5U7V6FDQAAAAEOR3JTJPI7Q7EFPHIOEUOEVVEHZ452BPDMPC2JCBNKBBWTJMHCBI")
+API_KEY = os.getenv("TON_API_KEY")
 IS_TESTNET = os.getenv("IS_TESTNET", "False") == "True"
 DECIMALS = 9
 DEFAULT_SLIPPAGE_BPS = 50
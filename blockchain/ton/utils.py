@@ -1,5 +1,6 @@
 import logging
 import aiohttp
+from blockchain.http import get_session
 from urllib.parse import quote
 import os
 
@@ -8,7 +9,7 @@ logger = logging.getLogger(__name__)
 # ======== Configuration ========
 IS_TESTNET = False
 # API Keys and URLs
-TON_KEY = "10e841ca2386a37d2fd7bdef7bdd271143da092418ff3337cfc45b2bd5f1d73e"
+TON_KEY = os.getenv("TON_KEY")  # TON Center key; requests go unauthenticated without it
 
 TON_API_URL = "https://testnet.toncenter.com/api/v2" if IS_TESTNET else "https://toncenter.com/api/v2"
 COINGECKO_API_URL = "https://api.coingecko.com/api/v3"
@@ -30,26 +31,26 @@ async def get_ton_balance(wallet_address: str) -> float:
     try:
         encoded_address = quote(wallet_address, safe="")
         url = f"{TON_API_URL}/getAddressInformation?address={encoded_address}"
-        headers = {"X-API-Key": TON_KEY} if TON_KEY != "YOUR_TONCENTER_API_KEY_HERE" else {}
+        headers = {"X-API-Key": TON_KEY} if TON_KEY else {}
 
-        async with aiohttp.ClientSession() as session:
-            logger.info(f"Querying TON balance ({'Testnet' if IS_TESTNET else 'Mainnet'}): {wallet_address}")
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data.get("ok"):
-                        nanotons = int(data["result"]["balance"])
-                        tons = nanotons / 1_000_000_000  # Convert nanotons to TON
-                        logger.info(f"Fetched TON balance for {wallet_address}: {tons} TON")
-                        return tons
-                    else:
-                        logger.error(f"TON API error for {wallet_address}: {data}")
-                        return 0.0
+        session = await get_session()
+        logger.info(f"Querying TON balance ({'Testnet' if IS_TESTNET else 'Mainnet'}): {wallet_address}")
+        async with session.get(url, headers=headers) as response:
+            if response.status == 200:
+                data = await response.json()
+                if data.get("ok"):
+                    nanotons = int(data["result"]["balance"])
+                    tons = nanotons / 1_000_000_000  # Convert nanotons to TON
+                    logger.info(f"Fetched TON balance for {wallet_address}: {tons} TON")
+                    return tons
                 else:
-                    logger.error(f"TON API request failed for {wallet_address}: {response.status}")
-                    text = await response.text()
-                    logger.error(f"Response details: {text}")
+                    logger.error(f"TON API error for {wallet_address}: {data}")
                     return 0.0
+            else:
+                logger.error(f"TON API request failed for {wallet_address}: {response.status}")
+                text = await response.text()
+                logger.error(f"Response details: {text}")
+                return 0.0
     except Exception as e:
         logger.error(f"Error fetching TON balance for {wallet_address}: {str(e)}")
         return 0.0
@@ -64,17 +65,17 @@ async def get_ton_price() -> float:
         float: Current TON price in USD (0.0 if failed).
     """
     try:
-        async with aiohttp.ClientSession() as session:
-            url = f"{COINGECKO_API_URL}/simple/price?ids=the-open-network&vs_currencies=usd"
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    price = data.get("the-open-network", {}).get("usd", 0.0)
-                    logger.info(f"Fetched TON price: ${price}")
-                    return price
-                else:
-                    logger.error(f"Failed to fetch TON price: {response.status}")
-                    return 0.0
+        session = await get_session()
+        url = f"{COINGECKO_API_URL}/simple/price?ids=the-open-network&vs_currencies=usd"
+        async with session.get(url) as response:
+            if response.status == 200:
+                data = await response.json()
+                price = data.get("the-open-network", {}).get("usd", 0.0)
+                logger.info(f"Fetched TON price: ${price}")
+                return price
+            else:
+                logger.error(f"Failed to fetch TON price: {response.status}")
+                return 0.0
     except Exception as e:
         logger.error(f"Error fetching TON price: {str(e)}")
         return 0.0
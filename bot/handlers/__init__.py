@@ -0,0 +1,23 @@
+"""
+Handler registry.
+
+Each handler module registers its PTB handlers on import; bot.main imports the
+modules and adds the handlers to the application in priority order. PTB runs the
+first matching handler in a group, so lower numbers take precedence.
+"""
+from typing import Iterable, List, Tuple
+from telegram.ext import BaseHandler
+
+HANDLERS: List[Tuple[int, BaseHandler]] = []
+
+def register(*handlers: BaseHandler, priority: int) -> None:
+    """Register handlers to be added to the application at the given priority."""
+    HANDLERS.extend((priority, handler) for handler in handlers)
+
+def registered_handlers(extra: Iterable[Tuple[int, BaseHandler]] = ()) -> List[BaseHandler]:
+    """
+    Registered handlers sorted by priority; registration order breaks ties.
+    `extra` (priority, handler) pairs are merged in for this call only, not registered.
+    """
+    entries = HANDLERS + list(extra)
+    return [handler for _, handler in sorted(entries, key=lambda entry: entry[0])]
@@ -1,6 +1,7 @@
 import logging
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import CallbackQueryHandler, ContextTypes, ConversationHandler, MessageHandler, filters
+from bot.handlers import register
 from database.db import get_async_session
 from services.wallet_management import get_wallet
 from services.utils import get_wallet_balance_and_usd
@@ -14,7 +15,17 @@ logger = logging.getLogger(__name__)
 TOKEN_ADDRESS, SET_AMOUNT, SET_SLIPPAGE, CONFIRM = range(4)
 
 # Import MAIN_MENU from main.py (we'll assume it's available)
-from handlers.constants import MAIN_MENU  # Adjust this import based on your file structure
+from bot.handlers.constants import MAIN_MENU
+
+def _build_buy_settings_markup(slippage: float, buy_amount: float, unit: str) -> InlineKeyboardMarkup:
+    """Trade-settings keyboard for the buy flow (pure; no Telegram I/O)."""
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton(f"Slippage: {slippage}%", callback_data="set_slippage"),
+         InlineKeyboardButton(f"Amount: {buy_amount} {unit}", callback_data="set_amount")],
+        [InlineKeyboardButton("Execute Trade", callback_data="buy_execute_trade"),
+         InlineKeyboardButton("Refresh", callback_data="refresh_token")],
+        [InlineKeyboardButton("Main Menu", callback_data="main_menu")]
+    ])
 
 async def buy_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     query = update.callback_query
@@ -64,15 +75,8 @@ async def token_address_handler(update: Update, context: ContextTypes.DEFAULT_TY
     context.user_data["buy_amount"] = 0.5 if chain == "solana" else 1.5
     context.user_data["slippage"] = 5.0  # Default manual slippage
 
-    formatted_info = await format_token_info(token_info, chain, wallet_balance, chain_price_usd, context)
-    keyboard = [
-        [InlineKeyboardButton(f"Slippage: {context.user_data['slippage']}%", callback_data="set_slippage"),
-         InlineKeyboardButton(f"Amount: {context.user_data['buy_amount']} {unit}", callback_data="set_amount")],
-        [InlineKeyboardButton("Execute Trade", callback_data="buy_execute_trade"),
-         InlineKeyboardButton("Refresh", callback_data="refresh_token")],
-        [InlineKeyboardButton("Main Menu", callback_data="main_menu")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    formatted_info = format_token_info(token_info, chain, wallet_balance, chain_price_usd, context)
+    reply_markup = _build_buy_settings_markup(context.user_data["slippage"], context.user_data["buy_amount"], unit)
 
     await update.message.reply_text(formatted_info, reply_markup=reply_markup, parse_mode="Markdown")
     logger.info(f"Displayed token details for {token_address} to user {user_id}")
@@ -125,19 +129,11 @@ async def refresh_token(update: Update, context: ContextTypes.DEFAULT_TYPE, from
     token_info, chain_price_usd = result
     context.user_data["token_info"] = token_info
 
-    formatted_info = await format_token_info(token_info, chain, wallet_balance, chain_price_usd, context)
+    formatted_info = format_token_info(token_info, chain, wallet_balance, chain_price_usd, context)
     unit = "SOL" if chain == "solana" else "TON"
     buy_amount = context.user_data.get("buy_amount", 0.5 if chain == "solana" else 1.5)
     slippage = context.user_data.get("slippage", 5.0)
-
-    keyboard = [
-        [InlineKeyboardButton(f"Slippage: {slippage}%", callback_data="set_slippage"),
-         InlineKeyboardButton(f"Amount: {buy_amount} {unit}", callback_data="set_amount")],
-        [InlineKeyboardButton("Execute Trade", callback_data="buy_execute_trade"),
-         InlineKeyboardButton("Refresh", callback_data="refresh_token")],
-        [InlineKeyboardButton("Main Menu", callback_data="main_menu")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = _build_buy_settings_markup(slippage, buy_amount, unit)
 
     if from_message:
         await update.message.reply_text(formatted_info, reply_markup=reply_markup, parse_mode="Markdown")
@@ -169,7 +165,7 @@ async def confirm_buy(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
         return ConversationHandler.END
 
     token_info = context.user_data["token_info"]
-    formatted_info = await format_token_info(token_info, chain, balance, 0, context)
+    formatted_info = format_token_info(token_info, chain, balance, 0, context)
 
     try:
         if chain == "solana":
@@ -244,3 +240,4 @@ buy_conv_handler = ConversationHandler(
     fallbacks=[CallbackQueryHandler(cancel_buy, pattern="^main_menu$")]
 )
 
+register(buy_conv_handler, priority=70)
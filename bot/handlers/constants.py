@@ -1,7 +1,29 @@
 # hanlders/constants.py
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
-MAIN_MENU = InlineKeyboardMarkup([
+
+class CachedInlineKeyboardMarkup(InlineKeyboardMarkup):
+    """
+    InlineKeyboardMarkup that serializes itself once at construction.
+
+    PTB calls to_dict() on every send/edit; static keyboards can hand back the
+    same dict instead of walking every button again. Only use it for keyboards
+    that are built once and never change.
+    """
+    __slots__ = ("_cached_dict",)
+
+    def __init__(self, inline_keyboard, *, api_kwargs=None):
+        super().__init__(inline_keyboard, api_kwargs=api_kwargs)
+        with self._unfrozen():
+            self._cached_dict = super().to_dict()
+
+    def to_dict(self, recursive: bool = True):
+        if not recursive:
+            return super().to_dict(recursive=False)
+        return dict(self._cached_dict)
+
+
+MAIN_MENU = CachedInlineKeyboardMarkup([
     [InlineKeyboardButton("🟩 Buy", callback_data="buy"),
      InlineKeyboardButton("🟥 Sell", callback_data="sell")],
     [InlineKeyboardButton("Positions", callback_data="positions"),
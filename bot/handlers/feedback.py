@@ -3,6 +3,7 @@ import logging
 import os
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler, MessageHandler, filters, CallbackQueryHandler
+from bot.handlers import register
 
 logger = logging.getLogger(__name__)
 from dotenv import load_dotenv
@@ -87,4 +88,6 @@ feedback_conv_handler = ConversationHandler(
         FEEDBACK_TEXT: [MessageHandler(filters.TEXT & ~filters.COMMAND, receive_feedback)],
     },
     fallbacks=[CallbackQueryHandler(cancel_feedback, pattern="^cancel_feedback$")]
-)
\ No newline at end of file
+)
+
+register(feedback_conv_handler, priority=30)
@@ -1,5 +1,6 @@
 from telegram import Update
 from telegram.ext import CommandHandler, CallbackQueryHandler, ContextTypes
+from bot.handlers import register
 import logging
 
 logger = logging.getLogger(__name__)
@@ -28,3 +29,6 @@ async def help_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 # Export handlers
 handler = CommandHandler("help", help_handler)
 callback_handler = CallbackQueryHandler(help_handler, pattern=r"^help$")  # Handle inline button clicks
+
+register(handler, priority=110)
+register(callback_handler, priority=120)
@@ -1,6 +1,7 @@
 import logging
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import CommandHandler, CallbackQueryHandler, ContextTypes
+from bot.handlers import register
 
 logger = logging.getLogger(__name__)
 
@@ -26,4 +27,6 @@ async def pnl_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
     logger.info(f"Displayed AI Mode PnL to user {user_id}")
 
 # Export handler
-pnl_handler = CallbackQueryHandler(pnl_handler, pattern="^pnl$")
\ No newline at end of file
+pnl_handler = CallbackQueryHandler(pnl_handler, pattern="^pnl$")
+
+register(pnl_handler, priority=170)
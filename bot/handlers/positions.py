@@ -1,6 +1,7 @@
 import logging
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import CallbackQueryHandler, ContextTypes
+from bot.handlers import register
 from database.db import get_async_session
 from services.wallet_management import get_wallet
 from services.token_info import get_token_info, detect_chain
@@ -105,4 +106,6 @@ async def positions_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
         logger.info(f"Displayed actual positions to user {user_id}")
 
 # Export handler
-positions_handler = CallbackQueryHandler(positions_handler, pattern="^positions$")
\ No newline at end of file
+positions_handler = CallbackQueryHandler(positions_handler, pattern="^positions$")
+
+register(positions_handler, priority=160)
@@ -1,19 +1,30 @@
 import logging
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import CallbackQueryHandler, ContextTypes, ConversationHandler, MessageHandler, filters
+from bot.handlers import register
 from database.db import get_async_session
 from services.wallet_management import get_wallet
 from services.utils import get_wallet_balance_and_usd, get_token_balance
 from services.token_info import get_token_info, format_token_info, detect_chain
 from blockchain.solana.trade import execute_solana_swap  # Placeholder for sell swap if needed
 from blockchain.ton.sell import execute_jetton_to_ton_swap
-from handlers.constants import MAIN_MENU
+from bot.handlers.constants import MAIN_MENU
 
 logger = logging.getLogger(__name__)
 
 # Conversation states
 TOKEN_ADDRESS, SET_AMOUNT, SET_SLIPPAGE, CONFIRM = range(4)
 
+def _build_sell_settings_markup(slippage: float, sell_amount: float, symbol: str) -> InlineKeyboardMarkup:
+    """Trade-settings keyboard for the sell flow (pure; no Telegram I/O)."""
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton(f"Slippage: {slippage}%", callback_data="set_slippage"),
+         InlineKeyboardButton(f"Amount: {sell_amount} {symbol}", callback_data="set_amount")],
+        [InlineKeyboardButton("Execute Trade", callback_data="sell_execute_trade"),
+         InlineKeyboardButton("Refresh", callback_data="refresh_token")],
+        [InlineKeyboardButton("Main Menu", callback_data="main_menu")]
+    ])
+
 async def sell_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     query = update.callback_query
     await query.answer()
@@ -65,15 +76,8 @@ async def token_address_handler(update: Update, context: ContextTypes.DEFAULT_TY
     context.user_data["sell_amount"] = 1.0  # Default sell amount
     context.user_data["slippage"] = 5.0  # Default slippage
 
-    formatted_info = await format_token_info(token_info, chain, wallet_balance, chain_price_usd, context)
-    keyboard = [
-        [InlineKeyboardButton(f"Slippage: {context.user_data['slippage']}%", callback_data="set_slippage"),
-         InlineKeyboardButton(f"Amount: {context.user_data['sell_amount']} {token_info['symbol']}", callback_data="set_amount")],
-        [InlineKeyboardButton("Execute Trade", callback_data="sell_execute_trade"),
-         InlineKeyboardButton("Refresh", callback_data="refresh_token")],
-        [InlineKeyboardButton("Main Menu", callback_data="main_menu")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    formatted_info = format_token_info(token_info, chain, wallet_balance, chain_price_usd, context, is_sell=True)
+    reply_markup = _build_sell_settings_markup(context.user_data["slippage"], context.user_data["sell_amount"], token_info["symbol"])
 
     await update.message.reply_text(formatted_info, reply_markup=reply_markup, parse_mode="Markdown")
     logger.info(f"Displayed token details for sell {token_address} to user {user_id}")
@@ -127,18 +131,10 @@ async def refresh_token(update: Update, context: ContextTypes.DEFAULT_TYPE, from
     token_info, chain_price_usd = result
     context.user_data["token_info"] = token_info
 
-    formatted_info = await format_token_info(token_info, chain, wallet_balance, chain_price_usd, context, is_sell=True)
+    formatted_info = format_token_info(token_info, chain, wallet_balance, chain_price_usd, context, is_sell=True)
     sell_amount = context.user_data.get("sell_amount", 1.0)
     slippage = context.user_data.get("slippage", 5.0)
-
-    keyboard = [
-        [InlineKeyboardButton(f"Slippage: {slippage}%", callback_data="set_slippage"),
-         InlineKeyboardButton(f"Amount: {sell_amount} {token_info['symbol']}", callback_data="set_amount")],
-        [InlineKeyboardButton("Execute Trade", callback_data="sell_execute_trade"),
-         InlineKeyboardButton("Refresh", callback_data="refresh_token")],
-        [InlineKeyboardButton("Main Menu", callback_data="main_menu")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = _build_sell_settings_markup(slippage, sell_amount, token_info["symbol"])
 
     if from_message:
         await update.message.reply_text(formatted_info, reply_markup=reply_markup, parse_mode="Markdown")
@@ -186,7 +182,7 @@ async def confirm_sell(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
         return ConversationHandler.END
 
     token_info = context.user_data["token_info"]
-    formatted_info = await format_token_info(token_info, chain, wallet_balance, 0, context, is_sell=True)
+    formatted_info = format_token_info(token_info, chain, wallet_balance, 0, context, is_sell=True)
 
     try:
         if chain == "solana":
@@ -250,3 +246,5 @@ sell_conv_handler = ConversationHandler(
     },
     fallbacks=[CallbackQueryHandler(cancel_sell, pattern="^main_menu$")]
 )
+
+register(sell_conv_handler, priority=80)
@@ -1,42 +1,88 @@
 import logging
+import re
+from functools import lru_cache, partial
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import CommandHandler, CallbackQueryHandler, ContextTypes, MessageHandler, filters
+from bot.handlers import register
+from bot.handlers.constants import CachedInlineKeyboardMarkup
 
 logger = logging.getLogger(__name__)
 
-# Default chain-specific settings (removed slippage)
-DEFAULT_TON_SETTINGS = {
-    "gas_fee": "medium",  # low, medium, high
-    "notifications": True,
-    "wallet_format": "user_friendly",
-    "currency": "USD"
-}
+# Default chain-specific settings (removed slippage). Built fresh per user so
+# one user's edits can never leak into someone else's defaults.
+def _default_ton() -> dict:
+    return {
+        "gas_fee": "medium",  # low, medium, high
+        "notifications": True,
+        "wallet_format": "user_friendly",
+        "currency": "USD"
+    }
 
-DEFAULT_SOLANA_SETTINGS = {
-    "gas_fee": "medium",
-    "notifications": True,
-    "wallet_format": "user_friendly",
-    "currency": "USD"
-}
 
+def _default_solana() -> dict:
+    return {
+        "gas_fee": "medium",
+        "notifications": True,
+        "wallet_format": "user_friendly",
+        "currency": "USD"
+    }
 
-async def settings_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Prompt user to choose which chain's settings to edit."""
-    user_id = str(update.effective_user.id)
 
-    # Initialize user settings if they don't exist
+def _ensure_settings(context: ContextTypes.DEFAULT_TYPE) -> dict:
+    """Initialize user settings if they don't exist and return them."""
     if "settings" not in context.user_data:
-        context.user_data["settings"] = {
-            "ton": DEFAULT_TON_SETTINGS.copy(),
-            "solana": DEFAULT_SOLANA_SETTINGS.copy()
-        }
-
-    keyboard = [
+        context.user_data["settings"] = {"ton": _default_ton(), "solana": _default_solana()}
+    return context.user_data["settings"]
+
+
+# Static menus are built once at import; the markup is immutable, so sharing is safe
+_CHAIN_PICKER_MARKUP = CachedInlineKeyboardMarkup([
+    [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")],
+    [InlineKeyboardButton("TON Settings", callback_data="chain_settings_ton"),
+     InlineKeyboardButton("Solana Settings", callback_data="chain_settings_solana")]
+])
+
+_GAS_FEE_MARKUP = CachedInlineKeyboardMarkup([
+    [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")],
+    [InlineKeyboardButton("Low", callback_data="gas_low"),
+     InlineKeyboardButton("Medium", callback_data="gas_medium"),
+     InlineKeyboardButton("High", callback_data="gas_high")],
+    [InlineKeyboardButton("Back", callback_data="settings_back")]
+])
+
+_WALLET_FORMAT_MARKUP = CachedInlineKeyboardMarkup([
+    [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")],
+    [InlineKeyboardButton("User Friendly", callback_data="wallet_user_friendly"),
+     InlineKeyboardButton("Raw", callback_data="wallet_raw")],
+    [InlineKeyboardButton("Back", callback_data="settings_back")]
+])
+
+_CURRENCY_MARKUP = CachedInlineKeyboardMarkup([
+    [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")],
+    [InlineKeyboardButton("USD", callback_data="currency_USD"),
+     InlineKeyboardButton("EUR", callback_data="currency_EUR")],
+    [InlineKeyboardButton("Back", callback_data="settings_back")]
+])
+
+
+@lru_cache(maxsize=128)
+def _chain_settings_markup(gas_fee: str, notifications: bool, wallet_format: str, currency: str) -> InlineKeyboardMarkup:
+    """Chain settings keyboard; memoized since only a handful of value combinations exist."""
+    return CachedInlineKeyboardMarkup([
         [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")],
-        [InlineKeyboardButton("TON Settings", callback_data="chain_settings_ton"),
-         InlineKeyboardButton("Solana Settings", callback_data="chain_settings_solana")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+        [InlineKeyboardButton(f"Gas Fee: {gas_fee.capitalize()}", callback_data="set_gas_fee")],
+        [InlineKeyboardButton(f"Notifications: {'On' if notifications else 'Off'}", callback_data="toggle_notifications")],
+        [InlineKeyboardButton(f"Wallet Format: {wallet_format.replace('_', ' ').capitalize()}", callback_data="set_wallet_format")],
+        [InlineKeyboardButton(f"Currency: {currency}", callback_data="set_currency")],
+        [InlineKeyboardButton("Done", callback_data="settings_done")]
+    ])
+
+
+async def settings_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Prompt user to choose which chain's settings to edit."""
+    user_id = str(update.effective_user.id)
+    _ensure_settings(context)
+    reply_markup = _CHAIN_PICKER_MARKUP
 
     if update.message:
         await update.message.reply_text(
@@ -57,27 +103,20 @@ async def settings_callback(update: Update, context: ContextTypes.DEFAULT_TYPE)
     query = update.callback_query
     await query.answer()
     user_id = str(update.effective_user.id)
-    settings = context.user_data["settings"]
+    settings = _ensure_settings(context)
 
     # Extract data and current chain
     data = query.data
     chain = context.user_data.get("current_chain")
 
-    if data.startswith("chain_settings_"):
-        chain = data.split("_")[2]
-        context.user_data["current_chain"] = chain
-        await show_chain_settings_menu(query, context, chain)
-        logger.info(f"User {user_id} selected {chain} settings")
+    # Parameterized callbacks ("<kind>_<arg>") go through the dispatch table
+    match = _CB.match(data)
+    if match:
+        await _CB_HANDLERS[match["kind"]](query, context, match["arg"])
 
     elif data == "set_gas_fee":
         await show_gas_fee_menu(query, chain)
 
-    elif data.startswith("gas_"):
-        gas_fee = data.split("_")[1]
-        settings[chain]["gas_fee"] = gas_fee
-        await show_chain_settings_menu(query, context, chain)
-        logger.info(f"User {user_id} set {chain} gas fee to {gas_fee}")
-
     elif data == "toggle_notifications":
         settings[chain]["notifications"] = not settings[chain]["notifications"]
         await show_chain_settings_menu(query, context, chain)
@@ -86,21 +125,9 @@ async def settings_callback(update: Update, context: ContextTypes.DEFAULT_TYPE)
     elif data == "set_wallet_format":
         await show_wallet_format_menu(query, chain)
 
-    elif data.startswith("wallet_"):
-        format_type = "_".join(data.split("_")[1:])
-        settings[chain]["wallet_format"] = format_type
-        await show_chain_settings_menu(query, context, chain)
-        logger.info(f"User {user_id} set {chain} wallet format to {format_type}")
-
     elif data == "set_currency":
         await show_currency_menu(query, chain)
 
-    elif data.startswith("currency_"):
-        currency = data.split("_")[1]
-        settings[chain]["currency"] = currency
-        await show_chain_settings_menu(query, context, chain)
-        logger.info(f"User {user_id} set {chain} currency to {currency}")
-
     elif data == "settings_done":
         await query.edit_message_text(
             f"✅ {chain.capitalize()} settings saved! Use /settings to adjust anytime."
@@ -116,64 +143,63 @@ async def settings_callback(update: Update, context: ContextTypes.DEFAULT_TYPE)
         logger.warning(f"User {user_id} selected unknown option: {data}")
 
 
+async def _on_chain_select(query, context: ContextTypes.DEFAULT_TYPE, chain: str) -> None:
+    context.user_data["current_chain"] = chain
+    await show_chain_settings_menu(query, context, chain)
+    logger.info(f"User {query.from_user.id} selected {chain} settings")
+
+
+async def _on_set_value(key: str, query, context: ContextTypes.DEFAULT_TYPE, value: str) -> None:
+    """Store a picked option (gas fee, wallet format, currency) for the current chain."""
+    chain = context.user_data.get("current_chain")
+    context.user_data["settings"][chain][key] = value
+    await show_chain_settings_menu(query, context, chain)
+    logger.info(f"User {query.from_user.id} set {chain} {key.replace('_', ' ')} to {value}")
+
+
+_CB = re.compile(r"^(?P<kind>chain_settings|gas|wallet|currency)_(?P<arg>\w+)$")
+_CB_HANDLERS = {
+    "chain_settings": _on_chain_select,
+    "gas": partial(_on_set_value, "gas_fee"),
+    "wallet": partial(_on_set_value, "wallet_format"),
+    "currency": partial(_on_set_value, "currency"),
+}
+
+
 async def show_chain_settings_menu(query, context: ContextTypes.DEFAULT_TYPE, chain: str) -> None:
     """Display chain-specific settings menu."""
     settings = context.user_data["settings"][chain]
-    keyboard = [
-        [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")],
-        [InlineKeyboardButton(f"Gas Fee: {settings['gas_fee'].capitalize()}", callback_data="set_gas_fee")],
-        [InlineKeyboardButton(f"Notifications: {'On' if settings['notifications'] else 'Off'}", callback_data="toggle_notifications")],
-        [InlineKeyboardButton(f"Wallet Format: {settings['wallet_format'].replace('_', ' ').capitalize()}", callback_data="set_wallet_format")],
-        [InlineKeyboardButton(f"Currency: {settings['currency']}", callback_data="set_currency")],
-        [InlineKeyboardButton("Done", callback_data="settings_done")]
-    ]
+    reply_markup = _chain_settings_markup(
+        settings["gas_fee"], settings["notifications"], settings["wallet_format"], settings["currency"]
+    )
 
     await query.edit_message_text(
         f"⚙️ Adjust your {chain.upper()} trading settings below:",
-        reply_markup=InlineKeyboardMarkup(keyboard)
+        reply_markup=reply_markup
     )
 
 
 async def show_gas_fee_menu(query, chain: str) -> None:
     """Show gas fee options."""
-    keyboard = [
-        [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")],
-        [InlineKeyboardButton("Low", callback_data="gas_low"),
-         InlineKeyboardButton("Medium", callback_data="gas_medium"),
-         InlineKeyboardButton("High", callback_data="gas_high")],
-        [InlineKeyboardButton("Back", callback_data="settings_back")]
-    ]
     await query.edit_message_text(
         f"Select gas fee preference for {chain.upper()}:",
-        reply_markup=InlineKeyboardMarkup(keyboard)
+        reply_markup=_GAS_FEE_MARKUP
     )
 
 
 async def show_wallet_format_menu(query, chain: str) -> None:
     """Show wallet format options."""
-    keyboard = [
-        [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")],
-        [InlineKeyboardButton("User Friendly", callback_data="wallet_user_friendly"),
-         InlineKeyboardButton("Raw", callback_data="wallet_raw")],
-        [InlineKeyboardButton("Back", callback_data="settings_back")]
-    ]
     await query.edit_message_text(
         f"Select wallet address format for {chain.upper()}:",
-        reply_markup=InlineKeyboardMarkup(keyboard)
+        reply_markup=_WALLET_FORMAT_MARKUP
     )
 
 
 async def show_currency_menu(query, chain: str) -> None:
     """Show currency options."""
-    keyboard = [
-        [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")],
-        [InlineKeyboardButton("USD", callback_data="currency_USD"),
-         InlineKeyboardButton("EUR", callback_data="currency_EUR")],
-        [InlineKeyboardButton("Back", callback_data="settings_back")]
-    ]
     await query.edit_message_text(
         f"Select fiat currency for {chain.upper()}:",
-        reply_markup=InlineKeyboardMarkup(keyboard)
+        reply_markup=_CURRENCY_MARKUP
     )
 
 
@@ -185,3 +211,6 @@ settings_callback_handler = CallbackQueryHandler(
 )
 settings_input_handler = MessageHandler(filters.TEXT & ~filters.COMMAND, lambda u, c: None)
 
+register(settings_command_handler, priority=130)
+register(settings_callback_handler, priority=140)
+register(settings_input_handler, priority=150)
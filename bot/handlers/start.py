@@ -1,6 +1,8 @@
 import logging
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from bot.handlers.constants import CachedInlineKeyboardMarkup
 from telegram.ext import ContextTypes, CommandHandler, CallbackQueryHandler
+from bot.handlers import register
 from database.db import get_async_session, get_user, add_user
 from services.wallet_management import create_user_wallet, get_wallet
 from services.utils import get_wallet_balance_and_usd, get_sol_price, get_ton_price  # Added price imports
@@ -10,7 +12,7 @@ import os
 ADMIN_TELEGRAM_ID = os.getenv("ADMIN_TELEGRAM_ID")
 
 # Updated trading menu (aligned with main.py)
-TRADING_MENU = InlineKeyboardMarkup([
+TRADING_MENU = CachedInlineKeyboardMarkup([
     [InlineKeyboardButton("🟩 Buy", callback_data="buy"),
      InlineKeyboardButton("🟥 Sell", callback_data="sell")],
     [InlineKeyboardButton("Positions", callback_data="positions"),
@@ -179,4 +181,7 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
 # Export handlers
 start_handler = CommandHandler("start", start)
-start_callback_handler = CallbackQueryHandler(handle_callback, pattern="^(agree|main_menu|import_wallet)$")
\ No newline at end of file
+start_callback_handler = CallbackQueryHandler(handle_callback, pattern="^(agree|main_menu|import_wallet)$")
+
+register(start_handler, priority=20)
+register(start_callback_handler, priority=40)
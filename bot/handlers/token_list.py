@@ -1,6 +1,7 @@
 import logging
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import CommandHandler, CallbackQueryHandler, ContextTypes
+from bot.handlers import register
 import aiohttp
 import asyncio
 
@@ -82,4 +83,6 @@ async def token_list_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
     logger.info(f"Displayed token list with live prices to user {user_id}")
 
 # Export handler
-token_list_handler = CallbackQueryHandler(token_list_handler, pattern="^token_list$")
\ No newline at end of file
+token_list_handler = CallbackQueryHandler(token_list_handler, pattern="^token_list$")
+
+register(token_list_handler, priority=180)
@@ -0,0 +1,24 @@
+import logging
+from typing import Optional
+from telegram import CallbackQuery, InlineKeyboardMarkup, Message
+
+logger = logging.getLogger(__name__)
+
+async def safe_edit_text(query: CallbackQuery, text: str, reply_markup: Optional[InlineKeyboardMarkup] = None, **kwargs) -> bool:
+    """
+    Edit the query's message unless it already shows this text and keyboard.
+
+    Telegram rejects such edits with 'Message is not modified'; skipping them saves
+    the round-trip and the exception. The check compares against the rendered text,
+    so it only short-circuits plain-text messages; formatted ones are always sent.
+    Inaccessible messages (too old, or deleted) carry no text, so they are always sent.
+
+    Returns:
+        True if the message was edited, False if the edit was skipped.
+    """
+    message = query.message
+    if isinstance(message, Message) and message.text == text and message.reply_markup == reply_markup:
+        logger.debug(f"Skipped no-op edit of message {message.message_id}")
+        return False
+    await query.edit_message_text(text, reply_markup=reply_markup, **kwargs)
+    return True
@@ -2,7 +2,9 @@
 import logging
 import base58
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from bot.handlers.constants import CachedInlineKeyboardMarkup
 from telegram.ext import CallbackQueryHandler, ContextTypes, ConversationHandler, MessageHandler, filters
+from bot.handlers import register
 from database.db import get_async_session
 from services.wallet_management import get_wallet
 from services.utils import get_wallet_balance_and_usd, refresh_handler, main_menu_handler, add_common_buttons
@@ -15,7 +17,7 @@ logger = logging.getLogger(__name__)
 # Conversation states for withdrawal
 WITHDRAW_AMOUNT, DESTINATION_ADDRESS, CONFIRM_WITHDRAW = range(3)
 
-WALLET_MAIN_MENU = InlineKeyboardMarkup([
+WALLET_MAIN_MENU = CachedInlineKeyboardMarkup([
     [InlineKeyboardButton("Solana Wallet", callback_data="solana_wallet"),
      InlineKeyboardButton("TON Wallet", callback_data="ton_wallet")],
     [InlineKeyboardButton("Back", callback_data="main_menu")]
@@ -76,11 +78,18 @@ async def detailed_wallet_handler(update: Update, context: ContextTypes.DEFAULT_
         await query.edit_message_text(msg, reply_markup=markup, parse_mode="Markdown")
     logger.info(f"Displayed {chain_display} wallet details for user {user_id}")
 
+# Placeholder replies for stubbed wallet actions, keyed by (action, chain)
+_COMING_SOON = {
+    (action, chain): f"{verb} {chain} wallet - feature coming soon!"
+    for action, verb in (("reset", "Resetting"), ("import", "Importing"))
+    for chain in ("solana", "ton")
+}
+
 async def reset_wallet(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     query = update.callback_query
     await query.answer()
     chain = "solana" if "solana" in query.data else "ton"
-    await query.edit_message_text(f"Resetting {chain} wallet - feature coming soon!", parse_mode="Markdown")
+    await query.edit_message_text(_COMING_SOON["reset", chain], parse_mode="Markdown")
     logger.info(f"User {update.effective_user.id} requested {chain} wallet reset - stubbed")
 
 async def export_wallet(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -142,7 +151,7 @@ async def import_wallet(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     query = update.callback_query
     await query.answer()
     chain = "solana" if "solana" in query.data else "ton"
-    await query.edit_message_text(f"Importing {chain} wallet - feature coming soon!", parse_mode="Markdown")
+    await query.edit_message_text(_COMING_SOON["import", chain], parse_mode="Markdown")
     logger.info(f"User {update.effective_user.id} requested {chain} wallet import - stubbed")
 
 async def withdraw_tokens(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -294,4 +303,6 @@ wallet_callbacks = [
         },
         fallbacks=[CallbackQueryHandler(main_menu_handler, pattern="^main_menu$")]
     )
-]
\ No newline at end of file
+]
+
+register(wallet_handler, *wallet_callbacks, priority=50)
@@ -2,6 +2,7 @@ import logging
 from datetime import datetime
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import CallbackQueryHandler, ContextTypes, MessageHandler, filters, ConversationHandler
+from bot.handlers import register
 from services.token_info import get_token_info, detect_chain
 from database.db import get_async_session, add_watchlist_token, get_watchlist_tokens, delete_watchlist_token
 
@@ -215,4 +216,6 @@ watchlist_conv_handler = ConversationHandler(
     fallbacks=[CallbackQueryHandler(display_watchlist, pattern="^main_menu$")]
 )
 
-watchlist_handler = watchlist_conv_handler
\ No newline at end of file
+watchlist_handler = watchlist_conv_handler
+
+register(watchlist_handler, priority=90)
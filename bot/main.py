@@ -1,42 +1,67 @@
 import sys
 import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
+import asyncio
+import atexit
+import copy
+import importlib
 import logging
+import queue
+import weakref
+from logging.handlers import QueueHandler, QueueListener
+from typing import Awaitable, Callable, Dict
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes, MessageHandler,filters,ConversationHandler
+from telegram.ext import Application, BaseUpdateProcessor, CommandHandler, CallbackQueryHandler, ContextTypes, MessageHandler,filters,ConversationHandler
 from telegram.error import BadRequest
+from telegram.request import HTTPXRequest
 from sqlalchemy.ext.asyncio import AsyncSession
-from database.db import get_async_session, get_user, add_user, update_user_ai_mode
-from bot.handlers.buy import buy_handler, buy_conv_handler
-from bot.handlers.wallet import wallet_handler, wallet_callbacks
-from bot.handlers.sell import sell_handler, sell_conv_handler
-from bot.handlers.start import start_handler, start_callback_handler
-from bot.handlers.settings import settings_handler  
-from bot.handlers.help import handler as help_command_handler, callback_handler as help_callback_handler
-from bot.handlers.settings import settings_command_handler, settings_callback_handler, settings_input_handler
-from bot.handlers.positions import positions_handler
-from bot.handlers.pnl import pnl_handler
-from bot.handlers.token_list import token_list_handler
-from bot.handlers.watchlist import watchlist_handler
-from bot.handlers.feedback import feedback_conv_handler , feedback_handler
+from database.db import get_async_session, get_user, add_user, update_user_ai_mode, warm_up_pool
+from bot.handlers import registered_handlers
 from bot.ai.agents.trading_agent import trading_agent
 from dotenv import load_dotenv
+from pythonjsonlogger.json import JsonFormatter
 from langchain_core.messages import HumanMessage, AIMessage,SystemMessage
 from bot.ai.prompts.trading_prompts import TRADING_PROMPT
-from services.token_info import detect_chain 
+from services.token_info import detect_chain, open_token_meta_store, close_token_meta_store
 from bot.handlers.token_details import token_details
+from bot.handlers.constants import CachedInlineKeyboardMarkup
+from bot.handlers.utils import safe_edit_text
+from blockchain.http import close_session as close_http_session
 
 load_dotenv()
-# Configure logging to save to a file
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("bot.log"),  # Save logs to bot.log
-        logging.StreamHandler()          # Optional: Keep console output
-    ]
-)
+# Configure logging: handlers only enqueue records; a listener thread formats them
+# as JSON and writes them to bot.log and the console, off the event loop
+_log_formatter = JsonFormatter("%(asctime)s %(name)s %(levelname)s %(message)s")
+_log_handlers = [
+    logging.FileHandler("bot.log"),  # Save logs to bot.log
+    logging.StreamHandler()          # Optional: Keep console output
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+
+class RawRecordQueueHandler(QueueHandler):
+    """
+    Enqueue records with their message resolved, leaving formatting to the listener.
+
+    The stock prepare() renders the message with the default formatter on the
+    calling thread and strips exc_info, so the JSON output lost its tracebacks.
+    Only msg % args is resolved here, so mutable args are logged as they were at
+    the call; exc_info is kept for the JsonFormatter. The queue never leaves this
+    process, so the record needs no pickling.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+log_listener = QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+logging.basicConfig(level=logging.INFO, handlers=[RawRecordQueueHandler(_log_queue)])
+log_listener.start()
+atexit.register(log_listener.stop)  # Flush queued records on any exit, including sys.exit
 logger = logging.getLogger(__name__)
 
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
@@ -45,8 +70,58 @@ if not TELEGRAM_TOKEN:
     logger.critical("TELEGRAM_TOKEN is missing from the environment!")
     sys.exit(1)
 
+# Webhook mode when WEBHOOK_URL (public https base URL) is set; long polling otherwise
+WEBHOOK_URL = os.getenv("WEBHOOK_URL")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8443"))
+WEBHOOK_PATH = "telegram"
+# Without a secret anyone who finds the URL can post forged updates
+if WEBHOOK_URL and not WEBHOOK_SECRET:
+    logger.critical("WEBHOOK_SECRET is required when WEBHOOK_URL is set!")
+    sys.exit(1)
+
+# Max updates processed at once; a slow token lookup no longer stalls everyone else
+CONCURRENT_UPDATES = 256
+
+class ChatSerializingUpdateProcessor(BaseUpdateProcessor):
+    """
+    Run updates from different chats concurrently, but one at a time per chat.
+
+    Keeps a user's quick Buy-then-Sell taps from racing each other's message edits
+    and conversation state. Locks are weakly held, so idle chats cost no memory.
+    The chat lock is taken before a concurrency slot, so updates queued behind a
+    busy chat wait without holding a slot that other chats could use.
+    """
+
+    def __init__(self, max_concurrent_updates: int):
+        super().__init__(max_concurrent_updates)
+        self._chat_locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    def _get_chat_lock(self, chat_id: int) -> asyncio.Lock:
+        lock = self._chat_locks.get(chat_id)
+        if lock is None:
+            lock = self._chat_locks[chat_id] = asyncio.Lock()
+        return lock
 
-MAIN_MENU = InlineKeyboardMarkup([
+    async def process_update(self, update: object, coroutine: Awaitable) -> None:
+        chat = update.effective_chat if isinstance(update, Update) else None
+        if chat is None:
+            await super().process_update(update, coroutine)
+            return
+        async with self._get_chat_lock(chat.id):
+            await super().process_update(update, coroutine)
+
+    async def do_process_update(self, update: object, coroutine: Awaitable) -> None:
+        await coroutine
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+
+MAIN_MENU = CachedInlineKeyboardMarkup([
     [InlineKeyboardButton("🟩 Buy", callback_data="buy"),
      InlineKeyboardButton("🟥 Sell", callback_data="sell")],
     [InlineKeyboardButton("Positions", callback_data="positions"),
@@ -78,19 +153,19 @@ async def ai_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
             await update.message.reply_text("AI Mode is now ON. Let’s chat!")
             state = {"messages": [SystemMessage(content=TRADING_PROMPT), HumanMessage(content="Hi")], "user_id": user_id}
             config = {"configurable": {"thread_id": str(user_id)}}
-            logger.info(f"Invoking agent with state: {state}")
+            logger.info("Invoking agent with state: %s", state)
             try:
                 result = await trading_agent.ainvoke(state, config)
                 response = result["messages"][-1].content
                 await update.message.reply_text(response, parse_mode="Markdown")
                 context.user_data["ai_messages"] = result["messages"]
             except Exception as e:
-                logger.error(f"Agent invocation failed: {str(e)}")
+                logger.error("Agent invocation failed: %s", e)
                 await update.message.reply_text("Oops, AI hiccup! Try again.")
         else:
             await update.message.reply_text("AI Mode is now OFF. Back to normal bot mode.")
             context.user_data.pop("ai_messages", None)
-            logger.info(f"User {user_id} toggled AI mode to OFF")
+            logger.info("User %s toggled AI mode to OFF", user_id)
 
 async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Central dispatcher for text messages."""
@@ -100,7 +175,7 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
     async with await get_async_session() as session:
         user = await get_user(user_id, session)
         if not user:
-            logger.debug(f"User {user_id} not found")
+            logger.debug("User %s not found", user_id)
             await update.message.reply_text("Please start the bot with /start first!")
             return
 
@@ -112,13 +187,13 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
                 chain = detect_chain(user_input)
                 await token_details(update, context)  # Call token_details directly
             except ValueError:
-                logger.debug(f"Not a token address: {user_input}, no action taken")
+                logger.debug("Not a token address: %s, no action taken", user_input)
                 # Optionally add fallback logic for other text commands here
                 # e.g., await some_other_handler(update, context)
 
 async def handle_ai_message(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, user_input: str) -> None:
     """Handle AI mode messages."""
-    logger.info(f"User {user_id} sent AI input: {user_input}")
+    logger.info("User %s sent AI input: %s", user_id, user_input)
     messages = context.user_data.get("ai_messages", [SystemMessage(content=TRADING_PROMPT)])
     messages.append(HumanMessage(content=user_input))
     state = {"messages": messages, "user_id": user_id}
@@ -128,16 +203,56 @@ async def handle_ai_message(update: Update, context: ContextTypes.DEFAULT_TYPE,
         result = await trading_agent.ainvoke(state, config)
         response = result["messages"][-1].content
         if not response:
-            logger.warning(f"Empty response from agent for user {user_id}")
+            logger.warning("Empty response from agent for user %s", user_id)
             await update.message.reply_text("Hmm, I’m stumped! Try again?")
             return
         context.user_data["ai_messages"] = result["messages"]
         await update.message.reply_text(response, parse_mode="Markdown")
-        logger.info(f"Sent AI response to user {user_id}: {response}")
+        logger.info("Sent AI response to user %s: %s", user_id, response)
     except Exception as e:
-        logger.error(f"Agent invocation failed for user {user_id}: {str(e)}")
+        logger.error("Agent invocation failed for user %s: %s", user_id, e)
         await update.message.reply_text("AI glitch! Let’s try that again.")
 
+async def show_main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    await safe_edit_text(update.callback_query, "Welcome to Not-Cotrader! Choose an option:", MAIN_MENU)
+    logger.info("User %s returned to main menu", update.effective_user.id)
+
+# Handler modules, imported by main() so each registers its handlers (see bot.handlers).
+# pnl and token_list are only reached from the main menu, so they load on first click
+HANDLER_MODULES = (
+    "start", "feedback", "wallet", "buy", "sell", "watchlist",
+    "help", "settings", "positions",
+)
+
+# Main menu routes, filled on the first menu click by _menu_routes()
+_MENU_ROUTES: Dict[str, Callable] = {}
+
+def _menu_routes() -> Dict[str, Callable]:
+    if not _MENU_ROUTES:
+        from bot.handlers.buy import buy_handler
+        from bot.handlers.sell import sell_handler
+        from bot.handlers.settings import settings_handler
+        from bot.handlers.wallet import wallet_handler
+        from bot.handlers.positions import positions_handler
+        from bot.handlers.pnl import pnl_handler
+        from bot.handlers.token_list import token_list_handler
+        from bot.handlers.help import callback_handler as help_callback_handler
+        from bot.handlers.feedback import feedback_handler
+        # Registered CallbackQueryHandlers are unwrapped to their callbacks
+        _MENU_ROUTES.update({
+            "main_menu": show_main_menu,
+            "buy": buy_handler,
+            "sell": sell_handler,
+            "settings": settings_handler,
+            "wallet": wallet_handler.callback,
+            "positions": positions_handler.callback,
+            "pnl": pnl_handler.callback,
+            "token_list": token_list_handler.callback,
+            "help": help_callback_handler.callback,
+            "feedback": feedback_handler,
+        })
+    return _MENU_ROUTES
+
 async def main_menu_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Handle the main menu display and basic button clicks.
@@ -158,31 +273,13 @@ async def main_menu_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
     """
     query = update.callback_query
     await query.answer()
-    
-    if query.data == "main_menu":
-        await query.edit_message_text("Welcome to Not-Cotrader! Choose an option:", reply_markup=MAIN_MENU)
-        logger.info(f"User {update.effective_user.id} returned to main menu")
-    elif query.data == "buy":
-        await buy_handler(update, context)  # Delegate to buy_handler
-    elif query.data == "sell":
-        await sell_handler(update, context)  # Delegate to sell_handler
-    elif query.data == "settings":
-        await settings_handler(update, context)
-    elif query.data == "wallet":
-        await wallet_handler(update, context)
-    elif query.data == "positions":
-        await positions_handler(update, context)
-    elif query.data == "pnl":
-        await pnl_handler(update, context)
-    elif query.data == "token_list":
-        await token_list_handler(update, context)
-    elif query.data == "help":
-        await help_callback_handler(update, context)
-    elif query.data == "feedback":
-        await feedback_handler(update, context)
+
+    route = _menu_routes().get(query.data)
+    if route:
+        await route(update, context)
     else:
-        logger.warning(f"Unknown callback data: {query.data}")
-        await query.edit_message_text("Invalid option. Use the menu below.", reply_markup=MAIN_MENU)
+        logger.warning("Unknown callback data: %s", query.data)
+        await safe_edit_text(query, "Invalid option. Use the menu below.", MAIN_MENU)
 
 async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
@@ -202,11 +299,11 @@ async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         - Logs full exception details with stack traces for debugging.
         - Handles both callback queries and message updates appropriately.
     """
-    if isinstance(context.error, BadRequest) and "Message is not modified" in str(context.error):
+    if isinstance(context.error, BadRequest) and context.error.message.startswith("Message is not modified"):
         logger.debug("Suppressed 'Message is not modified' error")
         return
 
-    logger.error(f"Exception occurred: {context.error}", exc_info=True)
+    logger.error("Exception occurred: %s", context.error, exc_info=context.error)
     if update.callback_query:
         query = update.callback_query
         await query.answer()
@@ -216,6 +313,17 @@ async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     else:
         logger.warning("Update object has no query or message to respond to.")
 
+async def post_init(application: Application) -> None:
+    """Warm long-lived resources before polling starts."""
+    await warm_up_pool()
+    await open_token_meta_store()
+
+async def post_shutdown(application: Application) -> None:
+    """Release long-lived resources once the application has stopped."""
+    await close_http_session()
+    logger.info("Closed shared HTTP sessions")
+    await close_token_meta_store()
+
 def main() -> None:
     """
     Initialize and run the Telegram bot.
@@ -234,40 +342,59 @@ def main() -> None:
         - Starts the job queue for scheduled tasks.
     """
     try:
-        app = Application.builder().token(TELEGRAM_TOKEN).build()
-
-        # Register handlers
-        app.add_handler(CommandHandler("ai", ai_command))
-        app.add_handler(start_handler)
-        app.add_handler(feedback_conv_handler)
-        app.add_handler(start_callback_handler)
-        app.add_handler(wallet_handler)
-        for callback in wallet_callbacks:
-            app.add_handler(callback)
-        app.add_handler(buy_conv_handler)
-        app.add_handler(sell_conv_handler)
-        app.add_handler(watchlist_handler)
-        # Single text message handler more robust handler coming
-        app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_text_message))
-        app.add_handler(help_command_handler)
-        app.add_handler(help_callback_handler)
-        app.add_handler(settings_command_handler)
-        app.add_handler(settings_callback_handler)
-        app.add_handler(settings_input_handler)
-        app.add_handler(positions_handler)
-        app.add_handler(pnl_handler)
-        app.add_handler(token_list_handler)
-        app.add_handler(CallbackQueryHandler(main_menu_handler))
+        # libuv-backed event loop underneath all aiohttp/httpx traffic (not available on Windows)
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            logger.info("Using uvloop event loop")
+        except ImportError:
+            logger.info("uvloop not installed, using the default asyncio event loop")
+
+        app = (
+            Application.builder()
+            .token(TELEGRAM_TOKEN)
+            .concurrent_updates(ChatSerializingUpdateProcessor(CONCURRENT_UPDATES))
+            .request(HTTPXRequest(connection_pool_size=64, http_version="2", read_timeout=10, connect_timeout=5))
+            # Separate pool so the long-poll never starves outbound API calls
+            .get_updates_request(HTTPXRequest(connection_pool_size=8))
+            .post_init(post_init)
+            .post_shutdown(post_shutdown)
+            .build()
+        )
+
+        # Register handlers: specific handlers first (low priority numbers), catch-all last
+        for name in HANDLER_MODULES:
+            importlib.import_module(f"bot.handlers.{name}")
+        # main.py's own handlers go straight to this app, slotted in by priority
+        own_handlers = [
+            (10, CommandHandler("ai", ai_command)),
+            # Single text message handler more robust handler coming
+            (100, MessageHandler(filters.TEXT & ~filters.COMMAND, handle_text_message)),
+            (1000, CallbackQueryHandler(main_menu_handler)),
+        ]
+        for handler in registered_handlers(own_handlers):
+            app.add_handler(handler)
         # Error handler
         app.add_error_handler(error_handler)
 
         # Initialize the job queue
         app.job_queue.start() 
 
-        logger.info("Bot starting with job queue enabled...")
-        app.run_polling(allowed_updates=Update.ALL_TYPES)
+        if WEBHOOK_URL:
+            logger.info("Bot starting in webhook mode on port %s with job queue enabled...", WEBHOOK_PORT)
+            app.run_webhook(
+                listen="0.0.0.0",
+                port=WEBHOOK_PORT,
+                url_path=WEBHOOK_PATH,
+                webhook_url=f"{WEBHOOK_URL.rstrip('/')}/{WEBHOOK_PATH}",
+                secret_token=WEBHOOK_SECRET,
+                allowed_updates=Update.ALL_TYPES
+            )
+        else:
+            logger.info("Bot starting with job queue enabled...")
+            app.run_polling(allowed_updates=Update.ALL_TYPES)
     except Exception as e:
-        logger.critical(f"Failed to start bot: {str(e)}", exc_info=True)
+        logger.critical("Failed to start bot: %s", e, exc_info=True)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,11 +1,12 @@
 import logging
+import asyncio
 from typing import Optional, List, Dict
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import delete
 from sqlalchemy.dialects.sqlite import insert
-from sqlalchemy import update
-from database.models import engine, AsyncSessionFactory, Base, User, Watchlist
+from sqlalchemy import update, text
+from database.models import engine, AsyncSessionFactory, Base, User, Watchlist, POOL_SIZE
 from dotenv import load_dotenv
 import os
 
@@ -19,6 +20,16 @@ async def init_db() -> None:
         await conn.run_sync(Base.metadata.create_all)
     logger.info("Database tables created")
 
+async def warm_up_pool() -> None:
+    """Open POOL_SIZE connections up front so the first updates don't pay for connecting."""
+    async def ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # Run concurrently so each ping holds its own connection, filling the pool
+    await asyncio.gather(*(ping() for _ in range(POOL_SIZE)))
+    logger.info(f"Database pool warmed with {POOL_SIZE} connections")
+
 async def get_async_session() -> AsyncSession:
     """Create and return an asynchronous database session."""
     try:
@@ -3,10 +3,19 @@ from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, JSON
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 # SQLite for prototyping; w PostgreSQL in production (e.g., "postgresql+asyncpg://...")
 DATABASE_URL = "sqlite+aiosqlite:///bot.db"
-engine = create_async_engine(DATABASE_URL, echo=False)  # Set echo=True for debugging
+POOL_SIZE = 20
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=False,  # Set echo=True for debugging
+    poolclass=AsyncAdaptedQueuePool,  # Async-safe queue pool; plain QueuePool blocks the event loop
+    pool_size=POOL_SIZE,
+    max_overflow=10,
+    pool_pre_ping=True
+)
 Base = declarative_base()
 
 class User(Base):
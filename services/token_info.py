@@ -1,13 +1,84 @@
+import asyncio
 import logging
-from typing import Dict, Optional, Tuple
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from contextlib import asynccontextmanager
+import aiosqlite
+import orjson
+from cachetools import LRUCache, TTLCache
 from telegram.ext import CallbackQueryHandler, ContextTypes, ConversationHandler
-from blockchain.solana.token import get_solana_token_info, get_sol_price
+from blockchain.solana.token import get_solana_token_info, get_sol_price, is_valid_solana_mint
 from blockchain.ton.token import get_ton_token_info, get_ton_price
-import aiohttp
+from blockchain.http import get_session
 
 logger = logging.getLogger(__name__)
 
+# Name/symbol never change for a token; images and links can, and quotes go stale
+# within seconds, so only the immutable fields are kept and persisted
+META_FIELDS: Tuple[str, ...] = ("name", "symbol", "address")
+TOKEN_META_CACHE: LRUCache = LRUCache(maxsize=4096)
+TOKEN_QUOTE_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=15)
+# On-disk store behind TOKEN_META_CACHE so metadata survives restarts; read on demand
+TOKEN_META_DB = "token_meta.db"
+_META_DB: Optional[aiosqlite.Connection] = None
+# In-flight lookups; concurrent callers for the same address await one task
+_INFLIGHT: "Dict[str, asyncio.Task[Optional[Tuple[Dict, float]]]]" = {}
+
+# TON: 48-char user-friendly address, base64url or standard base64; Solana: 40-44 base58 characters
+_TON_RE = re.compile(r"(?:EQ|UQ)[A-Za-z0-9_+/-]{46}")
+_SOL_RE = re.compile(r"[1-9A-HJ-NP-Za-km-z]{40,44}")
+
+# Per-chain (unit, default buy amount, explorer URL prefix) for format_token_info
+_CHAIN_DISPLAY: Dict[str, Tuple[str, float, str]] = {
+    "solana": ("SOL", 0.5, "https://solscan.io/token/"),
+    "ton": ("TON", 1.5, "https://tonscan.org/address/"),
+}
+
+async def open_token_meta_store() -> None:
+    """Open the on-disk metadata store; rows are read into TOKEN_META_CACHE on demand."""
+    global _META_DB
+    _META_DB = await aiosqlite.connect(TOKEN_META_DB)
+    await _META_DB.execute(
+        "CREATE TABLE IF NOT EXISTS token_meta ("
+        "address TEXT PRIMARY KEY, chain TEXT NOT NULL, symbol TEXT, name TEXT, meta TEXT NOT NULL)"
+    )
+    await _META_DB.commit()
+    logger.info("Opened token metadata store %s", TOKEN_META_DB)
+
+async def close_token_meta_store() -> None:
+    global _META_DB
+    if _META_DB is not None:
+        await _META_DB.close()
+        _META_DB = None
+
+async def _load_meta(token_address: str) -> Optional[Dict]:
+    meta = TOKEN_META_CACHE.get(token_address)
+    if meta is None and _META_DB is not None:
+        try:
+            async with _META_DB.execute("SELECT meta FROM token_meta WHERE address = ?", (token_address,)) as cursor:
+                row = await cursor.fetchone()
+        except aiosqlite.Error as e:
+            logger.warning("Failed to load token metadata for %s: %s", token_address, e)
+            return None
+        if row is not None:
+            # Rows written before META_FIELDS was narrowed may carry mutable fields too
+            meta = TOKEN_META_CACHE[token_address] = {k: v for k, v in orjson.loads(row[0]).items() if k in META_FIELDS}
+    return meta
+
+async def _persist_meta(token_address: str, chain: str, meta: Dict) -> None:
+    if _META_DB is None:
+        return
+    try:
+        await _META_DB.execute(
+            "INSERT OR IGNORE INTO token_meta (address, chain, symbol, name, meta) VALUES (?, ?, ?, ?, ?)",
+            (token_address, chain, meta.get("symbol"), meta.get("name"), orjson.dumps(meta).decode())
+        )
+        await _META_DB.commit()
+    except aiosqlite.Error as e:
+        logger.warning("Failed to persist token metadata for %s: %s", token_address, e)
+
+@lru_cache(maxsize=4096)
 def detect_chain(token_address: str) -> str:
     """
     Detect the blockchain chain based on the token address format.
@@ -21,15 +92,15 @@ def detect_chain(token_address: str) -> str:
     Raises:
         ValueError: If the address format is unrecognized.
     """
-    logger.info(f"Detecting chain for address: {token_address}")
-    if len(token_address) == 48 and token_address.startswith(("EQ", "UQ")):
-        logger.info(f"TON address detected: {token_address}")
+    logger.info("Detecting chain for address: %s", token_address)
+    if _TON_RE.fullmatch(token_address):
+        logger.info("TON address detected: %s", token_address)
         return "ton"
-    elif 40 <= len(token_address) <= 44 and not token_address.startswith(("EQ", "UQ")):
-        logger.info(f"Solana address detected: {token_address}")
+    elif _SOL_RE.fullmatch(token_address) and is_valid_solana_mint(token_address):
+        logger.info("Solana address detected: %s", token_address)
         return "solana"
     else:
-        logger.error(f"Unknown chain for address: {token_address}")
+        logger.error("Unknown chain for address: %s", token_address)
         raise ValueError("Invalid or unsupported token address")
 
 async def get_token_info(token_address: str) -> Optional[Tuple[Dict, float]]:
@@ -44,32 +115,60 @@ async def get_token_info(token_address: str) -> Optional[Tuple[Dict, float]]:
     """
     try:
         chain = detect_chain(token_address)
-        logger.info(f"Fetching token info for {token_address} on chain: {chain}")
-        
-        async with aiohttp.ClientSession() as session:
-            if chain == "solana":
-                token_info = await get_solana_token_info(token_address)
-                chain_price_usd = await get_sol_price(session)
-            elif chain == "ton":
-                token_info = await get_ton_token_info(token_address)
-                chain_price_usd = await get_ton_price(session)
-            else:
+        cached = TOKEN_QUOTE_CACHE.get(token_address)
+        if cached is None:
+            task = _INFLIGHT.get(token_address)
+            if task is None:
+                task = asyncio.create_task(_fetch_token_info(token_address, chain))
+                _INFLIGHT[token_address] = task
+                task.add_done_callback(lambda _: _INFLIGHT.pop(token_address, None))
+            # Shield so one cancelled caller does not cancel the lookup for the others
+            cached = await asyncio.shield(task)
+            if cached is None:
                 return None
-            
-            if token_info:
-                return token_info, chain_price_usd
-            return None
+        token_info, chain_price_usd = cached
+        return dict(token_info), chain_price_usd
     except ValueError as e:
-        logger.error(f"Token info failed: {str(e)}")
+        logger.error("Token info failed: %s", e)
         return None
 
-async def format_token_info(
+async def _fetch_token_info(token_address: str, chain: str) -> Optional[Tuple[Dict, float]]:
+    """Fetch token info and the native chain price upstream, then fill the caches."""
+    logger.info("Fetching token info for %s on chain: %s", token_address, chain)
+
+    meta = await _load_meta(token_address)
+    session = await get_session()
+    if chain == "solana":
+        # With the metadata on hand, only the quote needs fetching
+        token_info = await get_solana_token_info(token_address, with_metadata=meta is None)
+        chain_price_usd = await get_sol_price(session)
+    elif chain == "ton":
+        # The TonAPI jetton call also returns supply and holders, so it runs either way
+        token_info = await get_ton_token_info(token_address)
+        chain_price_usd = await get_ton_price(session)
+    else:
+        return None
+
+    if not token_info:
+        return None
+
+    if meta:
+        # Fallback sources may lack a name/symbol; keep the ones seen first
+        token_info.update(meta)
+    elif token_info.get("name", "Unknown") != "Unknown":
+        meta = TOKEN_META_CACHE[token_address] = {k: token_info[k] for k in META_FIELDS if k in token_info}
+        await _persist_meta(token_address, chain, meta)
+    result = TOKEN_QUOTE_CACHE[token_address] = (token_info, chain_price_usd)
+    return result
+
+def format_token_info(
     token_info: Dict,
     chain: str,
     wallet_balance: float,
     chain_price_usd: float,
     context: Optional[ContextTypes.DEFAULT_TYPE] = None,
-    show_explorer_link: bool = False  # Changed default to True
+    show_explorer_link: bool = False,  # Changed default to True
+    is_sell: bool = False
 ) -> str:
     """
     Format token info into a clear, readable Telegram message with dynamic trade details.
@@ -81,6 +180,7 @@ async def format_token_info(
         chain_price_usd: Current price of the chain's native token (TON or SOL) in USD.
         context: Optional Telegram context to access user_data for trade settings.
         show_explorer_link: Whether to show the blockchain explorer link (default: True).
+        is_sell: Show sell trade details (tokens -> native) instead of buy details.
 
     Returns:
         A formatted string for Telegram display.
@@ -100,18 +200,16 @@ async def format_token_info(
         else str(token_info['holders_count']) if token_info['holders_count'] > 0 else "Nil"
     )
     
+    unit, default_amount, explorer_prefix = _CHAIN_DISPLAY[chain]
+
     # Generate the explorer link, included by default if show_explorer_link is True
-    explorer_link = (
-        f"https://tonscan.org/address/{token_info['address']}" if chain == "ton"
-        else f"https://solscan.io/token/{token_info['address']}"
-    )
-    explorer_display = f"[{chain.capitalize()}scan]({explorer_link})" if show_explorer_link else ""
+    explorer_display = f"[{chain.capitalize()}scan]({explorer_prefix}{token_info['address']})" if show_explorer_link else ""
 
     links_display = "Links: Nil"
     social_links = token_info.get("social", [])
     website_links = token_info.get("websites", [])
     if social_links or website_links:
-        links = []
+        links: List[str] = []
         for link in social_links:
             if "t.me" in link:
                 links.append(f"[Telegram]({link})")
@@ -124,22 +222,34 @@ async def format_token_info(
     mint_display = "🟢" if token_info['mintable'] else "🔴"
     renounced_display = "🟢" if token_info['renounced'] else "🔴"
 
-    unit = "TON" if chain == "ton" else "SOL"
-    default_amount = 0.5 if chain == "solana" else 1.5
-    buy_amount = context.user_data.get("buy_amount", default_amount) if context else default_amount
-    slippage = context.user_data.get("slippage", 5) if context else 5
-
-    input_usd = buy_amount * chain_price_usd
-    if token_info['price_usd'] > 0:
-        output_tokens = input_usd / token_info['price_usd']
-        slippage_factor = 1 - (slippage / 100)
-        min_output_tokens = output_tokens * slippage_factor
-        trade_output = (
-            f"{buy_amount} {unit} (${input_usd:.2f}) → "
-            f"{min_output_tokens:.6f} {token_info['symbol']} (${min_output_tokens * token_info['price_usd']:.2f})"
-        )
+    user_data = context.user_data if context and context.user_data is not None else {}
+    slippage = user_data.get("slippage", 5)
+    slippage_factor = 1 - (slippage / 100)
+
+    if is_sell:
+        amount = user_data.get("sell_amount", 1.0)
+        amount_display = f"Sell Amount: {amount} {token_info['symbol']}"
+        input_usd = amount * token_info['price_usd']
+        if chain_price_usd > 0:
+            min_output = input_usd / chain_price_usd * slippage_factor
+            trade_output = (
+                f"{amount} {token_info['symbol']} (${input_usd:.2f}) → "
+                f"{min_output:.6f} {unit} (${min_output * chain_price_usd:.2f})"
+            )
+        else:
+            trade_output = f"{amount} {token_info['symbol']} (${input_usd:.2f}) → N/A"
     else:
-        trade_output = f"{buy_amount} {unit} (${input_usd:.2f}) → N/A"
+        amount = user_data.get("buy_amount", default_amount)
+        amount_display = f"Buy Amount: {amount} {unit}"
+        input_usd = amount * chain_price_usd
+        if token_info['price_usd'] > 0:
+            min_output = input_usd / token_info['price_usd'] * slippage_factor
+            trade_output = (
+                f"{amount} {unit} (${input_usd:.2f}) → "
+                f"{min_output:.6f} {token_info['symbol']} (${min_output * token_info['price_usd']:.2f})"
+            )
+        else:
+            trade_output = f"{amount} {unit} (${input_usd:.2f}) → N/A"
 
     # Conditionally include the explorer link in the header
     header = (
@@ -159,7 +269,7 @@ async def format_token_info(
         f"🔗 {links_display}\n"
         f"─────────────────\n"
         f"❗️ **Trade Details**\n"
-        f"Buy Amount: {buy_amount} {unit} • Slippage: {slippage}%\n"
+        f"{amount_display} • Slippage: {slippage}%\n"
         f"Trade     : {trade_output}\n"
         f"💸 Balance : {wallet_balance:.2f} {unit}\n"
         f"☀️ *Set trade and tap Execute*"
@@ -13,7 +13,7 @@ from solders.pubkey import Pubkey
 
 logger = logging.getLogger(__name__)
 
-TON_API_KEY = os.getenv("TON_API_KEY", "AGVENPU5U7V6FDQAAAAEOR3JTJPI7Q7EFPHIOEUOEVVEHZ452BPDMPC2JCBNKBBWTJMHCBI")
+TON_API_KEY = os.getenv("TON_API_KEY")
 IS_TESTNET = os.getenv("IS_TESTNET", "False") == "True"
 SOLANA_RPC_ENDPOINT = "https://api.mainnet-beta.solana.com"  # Adjust for testnet if needed
 
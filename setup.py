@@ -0,0 +1,14 @@
+import os
+from setuptools import setup
+
+# Opt-in AOT build (needs mypy installed): NOT_COTRADER_MYPYC=1 pip install --no-build-isolation .
+# Only pure, CPU-bound modules are compiled; PTB handler modules stay interpreted.
+# services/ has no __init__.py, so explicit package bases keep the name services.token_info
+MYPYC_MODULES = ["--explicit-package-bases", "services/token_info.py"]
+
+ext_modules = []
+if os.getenv("NOT_COTRADER_MYPYC") == "1":
+    from mypyc.build import mypycify
+    ext_modules = mypycify(MYPYC_MODULES)
+
+setup(ext_modules=ext_modules)